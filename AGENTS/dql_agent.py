@@ -1,14 +1,18 @@
 import numpy as np
 import random
-from collections import deque
 from tensorflow.keras import models, layers, optimizers
 from tensorflow.keras.losses import Huber
+from AGENTS.replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from AGENTS.numpy_policy import NumpyPolicy
 
 class DQLAgent:
-    def __init__(self, state_size, action_size):
+    def __init__(self, state_size, action_size, memory_size=5000, prioritized_replay=False):
         self.state_size = state_size
         self.action_size = action_size
-        self.memory = deque(maxlen=5000)
+        if prioritized_replay:
+            self.memory = PrioritizedReplayBuffer(memory_size, state_size)
+        else:
+            self.memory = ReplayBuffer(memory_size, state_size)
         self.gamma = 0.99
         self.epsilon = 1.0
         self.epsilon_min = 0.05
@@ -17,6 +21,7 @@ class DQLAgent:
         self.model = self._build_model()
         self.target_model = self._build_model()
         self.update_target_model()
+        self._policy = None  # NumPy copy of self.model for act(), rebuilt after the weights change
 
     def _build_model(self):
         model = models.Sequential()
@@ -29,38 +34,43 @@ class DQLAgent:
 
     def update_target_model(self):
         self.target_model.set_weights(self.model.get_weights())
+        self._policy = None
+
+    @property
+    def policy(self) -> NumpyPolicy:
+        """
+        Greedy policy of the online network evaluated with NumPy, refreshed lazily after each training step.
+        """
+        if self._policy is None:
+            self._policy = NumpyPolicy.from_keras(self.model)
+        return self._policy
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.add(state, action, reward, next_state, done)
 
     def act(self, state):
         if np.random.rand() <= self.epsilon:
             return random.randrange(self.action_size)
-        q_values = self.model.predict(state[np.newaxis, :], verbose=0)[0]
-        return np.argmax(q_values)
+        return self.policy.act(state)
 
     def replay(self, batch_size):
         if len(self.memory) < batch_size:
             return
 
-        minibatch = random.sample(self.memory, batch_size)
-
-        states = np.zeros((batch_size, self.state_size))
-        targets = np.zeros((batch_size, self.action_size))
-
-        for i, (state, action, reward, next_state, done) in enumerate(minibatch):
-            states[i] = state
-            target = self.model.predict(state[np.newaxis, :], verbose=0)[0]
+        states, actions, rewards, next_states, dones, indices, weights = self.memory.sample(batch_size)
 
-            if done:
-                target[action] = reward
-            else:
-                t = self.target_model.predict(next_state[np.newaxis, :], verbose=0)[0]
-                target[action] = reward + self.gamma * np.amax(t)
+        # One forward pass per network for the whole minibatch
+        targets = np.array(self.model.predict_on_batch(states))
+        next_q = np.array(self.target_model.predict_on_batch(next_states))
 
-            targets[i] = target
+        # Terminal transitions only keep their reward
+        rows = np.arange(batch_size)
+        predicted = targets[rows, actions].copy()
+        targets[rows, actions] = rewards + self.gamma * np.amax(next_q, axis=1) * (1.0 - dones)
+        self.memory.update_priorities(indices, targets[rows, actions] - predicted)
 
-        self.model.fit(states, targets, epochs=1, verbose=0, batch_size=batch_size)
+        self.model.train_on_batch(states, targets, sample_weight=weights)
+        self._policy = None
 
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
@@ -0,0 +1,157 @@
+import os
+import random
+
+import numpy as np
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+}
+
+
+class NumpyPolicy:
+    """
+    Inference-only copy of a DQL Q-network (a stack of Dense layers) evaluated with NumPy.
+
+    A single 7-float state costs a few matrix-vector products instead of a Keras predict call,
+    and a stacked (K, state_size) batch is evaluated in one pass.
+
+    Args:
+        weights (list[np.ndarray]): kernel, bias, kernel, bias, ... as returned by model.get_weights()
+        activations (list[str] | None): activation per layer (default: relu hidden layers, linear output)
+    """
+
+    def __init__(self, weights, activations=None):
+        self.kernels = [np.asarray(w, dtype=np.float32) for w in weights[0::2]]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in weights[1::2]]
+        if activations is None:
+            activations = ["relu"] * (len(self.kernels) - 1) + ["linear"]
+        unknown = set(activations) - set(ACTIVATIONS)
+        if unknown:
+            raise ValueError(f"Unsupported activations: {sorted(unknown)}")
+        self.activations = list(activations)
+        self.state_size = self.kernels[0].shape[0]
+        self.action_size = self.kernels[-1].shape[1]
+
+    @classmethod
+    def from_keras(cls, model):
+        dense_layers = [layer for layer in model.layers if layer.get_weights()]
+        weights, activations = [], []
+        for layer in dense_layers:
+            weights.extend(layer.get_weights())
+            activations.append(layer.get_config().get("activation", "linear"))
+        return cls(weights, activations)
+
+    @classmethod
+    def from_npz(cls, path: str):
+        with np.load(path, allow_pickle=False) as data:
+            n_layers = len(data["activations"])
+            weights = []
+            for i in range(n_layers):
+                weights.extend([data[f"kernel_{i}"], data[f"bias_{i}"]])
+            return cls(weights, data["activations"].tolist())
+
+    def save(self, path: str):
+        arrays = {}
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f"kernel_{i}"] = kernel
+            arrays[f"bias_{i}"] = bias
+        np.savez_compressed(path, activations=np.array(self.activations), **arrays)
+
+    def q_values(self, states) -> np.ndarray:
+        """
+        Q-values for a (K, state_size) batch or a single state (returns (K, actions) or (actions,)).
+        """
+        x = np.asarray(states, dtype=np.float32)
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            x = ACTIVATIONS[activation](x @ kernel + bias)
+        return x
+
+    __call__ = q_values
+
+    def act(self, state, epsilon: float = 0.0, rng=None) -> int:
+        """
+        Same semantics as DQLAgent.act: a random action with probability epsilon, otherwise the greedy one.
+
+        Args:
+            state (np.ndarray): one state vector
+            epsilon (float): exploration rate
+            rng (np.random.Generator | None): generator for exploration (default: the global generators)
+        """
+        if epsilon > 0:
+            if rng is None:
+                if np.random.rand() <= epsilon:
+                    return random.randrange(self.action_size)
+            elif rng.random() <= epsilon:
+                return int(rng.integers(self.action_size))
+        return int(np.argmax(self.q_values(state)))
+
+
+def verify_parity(model, policy: NumpyPolicy, n_states: int = 2048, seed: int = 0) -> float:
+    """
+    Check that the NumPy policy picks the same greedy action as the Keras model.
+
+    States are sampled around the simulator's ranges (boiler temp, outside temp, hour, solar, users,
+    capacity, target). Returns the largest absolute Q-value difference.
+
+    Raises:
+        ValueError: if the greedy actions differ on any state without a near-tie
+    """
+    rng = np.random.default_rng(seed)
+    states = np.column_stack([
+        rng.uniform(0, 100, n_states),
+        rng.uniform(5, 35, n_states),
+        rng.integers(0, 24, n_states),
+        rng.integers(0, 2, n_states),
+        rng.integers(1, 6, n_states),
+        rng.choice([50, 100, 150], n_states),
+        rng.uniform(55, 70, n_states),
+    ]).astype(np.float32)[:, :policy.state_size]
+
+    keras_q = np.asarray(model.predict_on_batch(states))
+    numpy_q = policy.q_values(states)
+    max_diff = float(np.abs(keras_q - numpy_q).max())
+
+    # Near-ties may legitimately flip on float32 rounding; every other state must agree
+    sorted_q = np.sort(keras_q, axis=1)
+    clear = sorted_q[:, -1] - sorted_q[:, -2] > 1e-4
+    mismatches = int((np.argmax(keras_q, axis=1) != np.argmax(numpy_q, axis=1))[clear].sum())
+    if mismatches:
+        raise ValueError(f"❌ NumPy policy disagrees with Keras on {mismatches} of {int(clear.sum())} states")
+    return max_diff
+
+
+def export_policy(model_path: str, npz_path: str = None) -> str:
+    """
+    Export the Dense weights of a trained Keras DQL model to .npz and check argmax parity.
+
+    Returns:
+        str: path of the written .npz file
+    """
+    from tensorflow.keras.models import load_model
+
+    npz_path = npz_path or os.path.splitext(model_path)[0] + ".npz"
+    model = load_model(model_path, compile=False)
+    policy = NumpyPolicy.from_keras(model)
+    max_diff = verify_parity(model, policy)
+    policy.save(npz_path)
+    print(f"✅ Exported policy to {npz_path} (max |ΔQ| vs Keras: {max_diff:.2e})")
+    return npz_path
+
+
+def load_policy(model_path: str, npz_path: str = None) -> NumpyPolicy:
+    """
+    NumPy policy for a Keras model file, re-exporting the .npz when it is missing or older than the model.
+    """
+    npz_path = npz_path or os.path.splitext(model_path)[0] + ".npz"
+    if not os.path.exists(npz_path) or os.path.getmtime(npz_path) < os.path.getmtime(model_path):
+        export_policy(model_path, npz_path)
+    return NumpyPolicy.from_npz(npz_path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    export_policy(*sys.argv[1:3] if len(sys.argv) > 1 else ["dql_boiler_model.h5"])
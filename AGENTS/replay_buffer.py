@@ -0,0 +1,178 @@
+import numpy as np
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity replay memory backed by preallocated NumPy columns.
+
+    Inserting overwrites the oldest transition in O(1) and sampling gathers a whole minibatch with
+    fancy indexing, so replay never re-packs Python tuples into arrays.
+
+    Args:
+        capacity (int): number of transitions kept
+        state_size (int): length of a state vector
+        seed (int | None): seed of the sampling generator
+    """
+
+    def __init__(self, capacity: int, state_size: int, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self._next = 0
+        self._size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def add(self, state, action, reward, next_state, done) -> int:
+        """
+        Store one transition and return the slot it was written to.
+        """
+        i = self._next
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones) -> np.ndarray:
+        """
+        Store a block of transitions (e.g. one rollout episode) with a single write per column.
+        Returns the slots written to.
+        """
+        n = min(len(actions), self.capacity)
+        indices = (self._next + np.arange(n)) % self.capacity
+        self.states[indices] = states[-n:]
+        self.actions[indices] = actions[-n:]
+        self.rewards[indices] = rewards[-n:]
+        self.next_states[indices] = next_states[-n:]
+        self.dones[indices] = dones[-n:]
+        self._next = (self._next + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+        return indices
+
+    def __len__(self):
+        return self._size
+
+    def _gather(self, indices):
+        return (self.states[indices], self.actions[indices], self.rewards[indices],
+                self.next_states[indices], self.dones[indices])
+
+    def sample(self, batch_size: int):
+        """
+        Uniform minibatch without replacement.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones, indices, weights); weights are all 1
+        """
+        indices = self.rng.choice(self._size, size=batch_size, replace=False)
+        return (*self._gather(indices), indices, np.ones(batch_size, dtype=np.float32))
+
+    def update_priorities(self, indices, td_errors):
+        """
+        Uniform sampling ignores priorities.
+        """
+        pass
+
+
+class SumTree:
+    """
+    Binary tree whose leaves hold priorities and whose inner nodes hold the sum of their children.
+    Leaf i lives at node `leaves + i`; node 1 is the root.
+    """
+
+    def __init__(self, capacity: int):
+        self.leaves = 1 << max(capacity - 1, 1).bit_length()
+        self.depth = self.leaves.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return self.nodes[1]
+
+    def update(self, indices, priorities):
+        nodes = np.asarray(indices) + self.leaves
+        self.nodes[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values) -> np.ndarray:
+        """
+        Leaf index of each prefix-sum value, descending the tree for the whole batch at once.
+        """
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values > self.nodes[left]
+            values -= np.where(go_right, self.nodes[left], 0.0)
+            nodes = left + go_right
+        return nodes - self.leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Replay memory with proportional prioritized sampling (Schaul et al., 2016) on a sum tree.
+
+    New transitions get the highest priority seen so far; replay() feeds back the TD errors of
+    each minibatch through update_priorities().
+
+    Args:
+        capacity (int): number of transitions kept
+        state_size (int): length of a state vector
+        alpha (float): how strongly priorities skew sampling (0 = uniform)
+        beta (float): importance-sampling correction, annealed towards 1 by beta_increment per sample
+        beta_increment (float): beta step per sampled minibatch
+        epsilon (float): keeps zero-error transitions sampleable
+        seed (int | None): seed of the sampling generator
+    """
+
+    def __init__(self, capacity: int, state_size: int, alpha: float = 0.6, beta: float = 0.4,
+                 beta_increment: float = 0.001, epsilon: float = 1e-5, seed=None):
+        super().__init__(capacity, state_size, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def add(self, state, action, reward, next_state, done) -> int:
+        i = super().add(state, action, reward, next_state, done)
+        self.tree.update([i], [self.max_priority])
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones) -> np.ndarray:
+        indices = super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(indices, np.full(len(indices), self.max_priority))
+        return indices
+
+    def sample(self, batch_size: int):
+        """
+        Stratified proportional minibatch.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones, indices, weights) where weights are the
+            normalized importance-sampling weights
+        """
+        total = self.tree.total
+        bounds = np.linspace(0.0, total, batch_size + 1)
+        values = self.rng.uniform(bounds[:-1], bounds[1:])
+        indices = np.minimum(self.tree.find(values), self._size - 1)
+
+        probs = self.tree.nodes[indices + self.tree.leaves] / total
+        weights = (self._size * probs) ** -self.beta
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return (*self._gather(indices), indices, weights)
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, float(priorities.max()))
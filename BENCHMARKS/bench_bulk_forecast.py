@@ -0,0 +1,53 @@
+# === bench_bulk_forecast.py ===
+# Fetches forecasts for a synthetic fleet of households from the local Open-Meteo stub, once with one
+# request per household and once through the bulk API (grid-cell dedup + batched requests), and compares
+# HTTP calls, wall time and the returned feature matrices.
+# Run from the repository root: python BENCHMARKS/bench_bulk_forecast.py
+
+import os
+import sys
+import time
+import numpy as np
+
+os.environ["WEATHER_CACHE_BACKEND"] = "memory"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import UTILS.weatherAPIRequest as weather
+import UTILS.forecastCache as forecast_cache
+from tests.openmeteo_stub import OpenMeteoStub
+
+HOUSEHOLDS = 300
+HOURS_AHEAD = 6
+
+# Households spread over the center of Israel, many of them sharing a grid cell
+rng = np.random.default_rng(0)
+locations = [(31.5 + rng.uniform(0, 1.0), 34.7 + rng.uniform(0, 0.6)) for _ in range(HOUSEHOLDS)]
+
+with OpenMeteoStub() as stub:
+    os.environ[weather.OPEN_METEO_URL_ENV] = stub.url
+
+    # --- One request per household (what a per-user nightly loop costs without any cache) ---
+    start_time = time.perf_counter()
+    per_user = []
+    for lat, lon in locations:
+        lat, lon = forecast_cache.snap_to_cell(lat, lon)
+        per_user.append(weather._model_input(weather.fetch_forecast_frame(lat, lon), HOURS_AHEAD))
+    per_user_time = time.perf_counter() - start_time
+    per_user_requests = stub.requests
+
+    # --- Bulk: dedup by grid cell, batched upstream requests ---
+    weather.reset_client()
+    forecast_cache.clear_forecast_cache()
+    start_time = time.perf_counter()
+    bulk = forecast_cache.get_forecasts_for_locations(locations, HOURS_AHEAD)
+    bulk_time = time.perf_counter() - start_time
+    bulk_requests = stub.requests - per_user_requests
+
+for (_, old_x), (_, new_x) in zip(per_user, bulk):
+    assert np.array_equal(old_x.to_numpy(), new_x.to_numpy()), "❌ Bulk forecast differs from the per-user one"
+
+cells = len({forecast_cache.snap_to_cell(lat, lon) for lat, lon in locations})
+print(f"🏠 Households: {HOUSEHOLDS}, grid cells: {cells}")
+print(f"🐢 Per household: {HOUSEHOLDS} calls, {per_user_requests} reached the server (HTTP cache), {per_user_time * 1000:.0f} ms")
+print(f"⚡ Bulk:          {bulk_requests} requests, {bulk_time * 1000:.0f} ms")
+print(f"🚀 Speed-up: {per_user_time / bulk_time:.1f}x")
+print("✅ Same feature matrices for every household")
@@ -0,0 +1,72 @@
+# === bench_dql_replay.py ===
+# Training throughput of DQLAgent.replay: the per-transition predict loop (64 Keras calls per step)
+# against the batched replay (one forward pass per network + one compiled train step).
+# Run from the repository root: python BENCHMARKS/bench_dql_replay.py
+
+import os
+import random
+import sys
+import time
+from collections import deque
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from SIM.BoilerSimulator import BoilerSimulator
+from AGENTS.dql_agent import DQLAgent
+
+BATCH_SIZE = 32
+TRANSITIONS = 2000
+OLD_STEPS = 5  # the per-sample loop takes seconds per step
+NEW_STEPS = 200
+
+# --- Fill the replay memory from the simulator with random actions ---
+np.random.seed(0)
+random.seed(0)
+env = BoilerSimulator(boiler_capacity_liters=100, heater_power_kw=3.0, has_solar=True, num_users=2,
+                      weather_forecast=pd.Series(np.random.uniform(10, 30, size=24 * 7)))
+state = env.reset(target_temp=65)
+agent = DQLAgent(state_size=state.shape[0], action_size=2)
+agent.epsilon_min = agent.epsilon = 1.0  # keep epsilon fixed so both runs do identical work
+legacy_memory = deque(maxlen=5000)  # the tuple deque the per-sample loop sampled from
+
+for _ in range(TRANSITIONS):
+    action = random.randrange(2)
+    next_state, reward, done = env.step(action)
+    agent.remember(state, action, reward, next_state, done)
+    legacy_memory.append((state, action, reward, next_state, done))
+    state = env.reset(target_temp=65) if done else next_state
+
+
+def per_sample_replay(agent, batch_size):
+    """The replay loop used before batching."""
+    minibatch = random.sample(legacy_memory, batch_size)
+    states = np.zeros((batch_size, agent.state_size))
+    targets = np.zeros((batch_size, agent.action_size))
+    for i, (state, action, reward, next_state, done) in enumerate(minibatch):
+        states[i] = state
+        target = agent.model.predict(state[np.newaxis, :], verbose=0)[0]
+        if done:
+            target[action] = reward
+        else:
+            t = agent.target_model.predict(next_state[np.newaxis, :], verbose=0)[0]
+            target[action] = reward + agent.gamma * np.amax(t)
+        targets[i] = target
+    agent.model.fit(states, targets, epochs=1, verbose=0, batch_size=batch_size)
+
+
+def steps_per_second(step, steps):
+    step()  # warm-up (graph tracing)
+    start_time = time.perf_counter()
+    for _ in range(steps):
+        step()
+    return steps / (time.perf_counter() - start_time)
+
+
+old_rate = steps_per_second(lambda: per_sample_replay(agent, BATCH_SIZE), OLD_STEPS)
+new_rate = steps_per_second(lambda: agent.replay(BATCH_SIZE), NEW_STEPS)
+
+print(f"🧠 Replay memory: {len(agent.memory)} transitions, batch size: {BATCH_SIZE}")
+print(f"🐢 Per-sample predict: {old_rate:.2f} steps/s")
+print(f"⚡ Batched replay:     {new_rate:.1f} steps/s")
+print(f"🚀 Speed-up: {new_rate / old_rate:.1f}x")
@@ -0,0 +1,58 @@
+# === bench_forecast_inference.py ===
+# Compares the old per-window LSTM loop with BoilerManager.predict_forecast_windows
+# Run from the repository root: python BENCHMARKS/bench_forecast_inference.py
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from DVCS.Boiler import BoilerManager
+
+# Model and scalers are loaded relative to the Backend folder, like the Flask app does
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Backend"))
+
+HOURS = 48
+REPEATS = 5
+
+boiler = BoilerManager(name="bench", capacity_liters=100, has_solar=True)
+
+# --- Synthetic 48-hour model input inside the scaler's training range ---
+rng = np.random.default_rng(0)
+low = boiler.scaler_x.data_min_
+high = boiler.scaler_x.data_max_
+l_input = pd.DataFrame(
+    rng.uniform(low, high, size=(HOURS, len(low))),
+    columns=boiler.expected_features
+).astype(np.float32)
+
+
+def per_window_forecast(l_input):
+    """The loop simulate_day_usage_with_custom_temps used before batching."""
+    forecast_temps = []
+    for i in range(len(l_input) - 5):
+        sequence = l_input.iloc[i:i + 6]
+        X = np.expand_dims(boiler.scaler_x.transform(sequence), axis=0)
+        y_pred_scaled = boiler.model.predict(X, verbose=0)
+        forecast_temps.append(boiler.scaler_y.inverse_transform(y_pred_scaled)[0])
+    return np.array(forecast_temps)
+
+
+def timed(func):
+    func(l_input)  # warm-up (graph tracing)
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func(l_input)
+    return result, (time.perf_counter() - start) / REPEATS
+
+
+old_result, old_time = timed(per_window_forecast)
+new_result, new_time = timed(boiler.predict_forecast_windows)
+
+print(f"🪟 Windows per request: {len(new_result)}")
+print(f"🐢 Per-window loop:  {old_time * 1000:.1f} ms/request")
+print(f"⚡ Batched forward:  {new_time * 1000:.1f} ms/request")
+print(f"🚀 Speed-up: {old_time / new_time:.1f}x")
+print(f"🔍 Max abs difference: {np.abs(old_result - new_result).max():.2e} °C")
@@ -0,0 +1,79 @@
+# === bench_heating_start_times.py ===
+# Compares the row-by-row calc_start_heating_time scan with the vectorized calc_start_heating_times
+# for a 20-shower household schedule over a 48-hour forecast.
+# Run from the repository root: python BENCHMARKS/bench_heating_start_times.py
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from DVCS.Boiler import BoilerManager
+
+SHOWERS = 20
+FORECAST_HOURS = 48
+REPEATS = 200
+
+boiler = BoilerManager(name="bench", capacity_liters=100, has_solar=True, history_path=None)
+key = "boiler temp for 100 L with solar system"
+
+# --- Synthetic forecast and a 20-shower schedule spread over the next two days ---
+rng = np.random.default_rng(0)
+start = datetime.now().replace(minute=0, second=0, microsecond=0)
+forecast_df = pd.DataFrame({
+    "time": pd.date_range(start, periods=FORECAST_HOURS, freq="h"),
+    key: rng.uniform(25, 60, FORECAST_HOURS).astype(np.float32)
+})
+targets = [
+    (start + timedelta(minutes=int(m)), float(t))
+    for m, t in zip(rng.integers(60, FORECAST_HOURS * 60, SHOWERS), rng.uniform(36, 45, SHOWERS))
+]
+
+
+def scan_start_heating_time(forecast_df, boiler_key, target_time, target_temp):
+    """The per-shower iterrows() scan used before vectorization."""
+    c = 4.186
+    mass_kg = boiler.capacity_liters
+    power_kj_per_min = boiler.power_usage * 1000 / 60
+    efficiency = 0.9
+    relevant_forecast = forecast_df[(forecast_df["time"] <= target_time)].sort_values("time", ascending=False)
+    for _, row in relevant_forecast.iterrows():
+        forecast_time = row["time"]
+        temp_now = row[boiler_key]
+        delta_T = target_temp - temp_now
+        if delta_T <= 0:
+            return None, temp_now
+        time_needed_minutes = mass_kg * c * delta_T / (power_kj_per_min * efficiency)
+        heating_start_time = target_time - timedelta(minutes=time_needed_minutes)
+        if heating_start_time >= forecast_time:
+            return heating_start_time, temp_now
+    return None, None
+
+
+def per_shower():
+    return [scan_start_heating_time(forecast_df, key, t, temp) for t, temp in targets]
+
+
+def vectorized():
+    return boiler.calc_start_heating_times(forecast_df, key, targets)
+
+
+def timed(func):
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func()
+    return result, (time.perf_counter() - start_time) / REPEATS
+
+
+old_result, old_time = timed(per_shower)
+new_result, new_time = timed(vectorized)
+
+mismatches = sum(a != b for a, b in zip(old_result, new_result))
+print(f"🚿 Showers: {SHOWERS}, forecast rows: {FORECAST_HOURS}")
+print(f"🐢 iterrows scan:  {old_time * 1000:.2f} ms/schedule")
+print(f"⚡ Vectorized:     {new_time * 1000:.2f} ms/schedule")
+print(f"🚀 Speed-up: {old_time / new_time:.1f}x")
+print(f"🔍 Mismatching (start_time, temp) pairs: {mismatches}")
@@ -0,0 +1,77 @@
+# === bench_parallel_rollout.py ===
+# Wall time of the DQL training loop for a fixed number of episodes: serial acting + learning versus
+# the RolloutPool learner (drains every finished episode, same replays per transition) with 1, 2 and 4
+# rollout workers. Speed-up only appears when the machine has spare cores for the workers.
+# Run from the repository root: python BENCHMARKS/bench_parallel_rollout.py
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from SIM.BoilerSimulator import BoilerSimulator
+from AGENTS.dql_agent import DQLAgent
+from TRAINING.parallel_rollout import RolloutPool
+
+N_EPISODES = 60
+EPISODE_LENGTH = 24
+BATCH_SIZE = 32
+WORKER_COUNTS = (1, 2, 4)
+ENV_SETTINGS = dict(boiler_capacity_liters=100, heater_power_kw=3.0, has_solar=True, num_users=2)
+REPLAYS_PER_STEP = len(range(0, EPISODE_LENGTH, 20)) / EPISODE_LENGTH
+
+
+def new_agent():
+    np.random.seed(0)
+    return DQLAgent(state_size=7, action_size=2, memory_size=5000)
+
+
+def serial():
+    agent = new_agent()
+    env = BoilerSimulator(weather_forecast=pd.Series(np.random.uniform(10, 30, size=24 * 7)), **ENV_SETTINGS)
+    start_time = time.perf_counter()
+    for e in range(N_EPISODES):
+        state = env.reset(target_temp=np.random.randint(60, 70))
+        for t in range(EPISODE_LENGTH):
+            action = agent.act(state)
+            next_state, reward, done = env.step(action)
+            agent.remember(state, action, reward, next_state, done)
+            state = next_state
+            if t % 20 == 0:
+                agent.replay(BATCH_SIZE)
+        if e % 5 == 0:
+            agent.update_target_model()
+    return time.perf_counter() - start_time
+
+
+def parallel(num_workers):
+    agent = new_agent()
+    pool = RolloutPool(agent, num_workers=num_workers, env_settings=ENV_SETTINGS, episode_length=EPISODE_LENGTH)
+    start_time = time.perf_counter()
+    e = 0
+    while e < N_EPISODES:
+        episodes = pool.drain(max_episodes=N_EPISODES - e)
+        n_transitions = 0
+        for states, actions, rewards, next_states, dones in episodes:
+            agent.memory.add_batch(states, actions, rewards, next_states, dones)
+            n_transitions += len(actions)
+        for _ in range(int(np.ceil(n_transitions * REPLAYS_PER_STEP))):
+            agent.replay(BATCH_SIZE)
+        pool.publish(agent)
+        for _ in episodes:
+            if e % 5 == 0:
+                agent.update_target_model()
+            e += 1
+    elapsed = time.perf_counter() - start_time
+    pool.close()
+    return elapsed
+
+
+serial_time = serial()
+print(f"🖥 CPUs available: {len(os.sched_getaffinity(0))}, episodes: {N_EPISODES} x {EPISODE_LENGTH} h")
+print(f"🐢 Serial:    {serial_time:.2f} s")
+for num_workers in WORKER_COUNTS:
+    parallel_time = parallel(num_workers)
+    print(f"⚡ {num_workers} worker(s): {parallel_time:.2f} s  ({serial_time / parallel_time:.2f}x)")
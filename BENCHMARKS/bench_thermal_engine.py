@@ -0,0 +1,91 @@
+# === bench_thermal_engine.py ===
+# Compares the scalar compute_solar_heating / compute_physical_cooling calls with the vectorized
+# ThermalEngine for every (capacity, solar, start temperature) configuration over a 48-hour horizon.
+# With the measurement noise switched off both paths must agree to float precision; the noisy runs are
+# only compared statistically.
+# Run from the repository root: python BENCHMARKS/bench_thermal_engine.py
+
+import contextlib
+import io
+import os
+import sys
+import time
+from datetime import datetime
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from DVCS.Boiler import BoilerManager, BOILER_SIZES
+from DVCS.ThermalEngine import ThermalEngine
+
+HOURS = 48
+START_TEMPS = np.linspace(25, 60, 20)
+REPEATS = 5
+
+boiler = BoilerManager(name="bench", capacity_liters=100, has_solar=True, history_path=None)
+
+# --- Synthetic weather and one configuration per (size, solar, start temperature) ---
+rng = np.random.default_rng(0)
+times = pd.date_range(datetime(2025, 6, 1), periods=HOURS, freq="h")
+hours, months = times.hour.to_numpy(), times.month.to_numpy()
+radiation = np.clip(900 * np.sin(np.pi * (hours - 6) / 12), 0, None) * rng.uniform(0.7, 1.0, HOURS)
+cloud_cover = rng.uniform(0, 0.4, HOURS)
+ambient = 22 + 6 * np.sin(np.pi * (hours - 9) / 12)
+wind = rng.uniform(0, 6, HOURS)
+
+configs = [(size, solar, temp) for size in BOILER_SIZES for solar in (True, False) for temp in START_TEMPS]
+volumes = np.array([c[0] for c in configs])
+has_solar = np.array([c[1] for c in configs])
+start_temps = np.array([c[2] for c in configs])
+
+
+def scalar_loop():
+    trajectory = np.empty((len(configs), HOURS))
+    # compute_solar_heating prints a debug line per call; keep it out of the timing output
+    with contextlib.redirect_stdout(io.StringIO()):
+        for k, (size, solar, temp) in enumerate(configs):
+            for h in range(HOURS):
+                if solar:
+                    temp = boiler.compute_solar_heating(temp, radiation[h], cloud_cover[h], hours[h], months[h], size)
+                temp = BoilerManager.compute_physical_cooling(temp, ambient[h], size, hours[h], wind[h])
+                trajectory[k, h] = temp
+    return trajectory
+
+
+def vectorized(engine=None):
+    engine = engine or ThermalEngine(seed=0)
+    return engine.simulate(start_temps, volumes, has_solar, radiation, cloud_cover, ambient, wind,
+                           hours, months, apply_cooling=True)
+
+
+def no_noise(loc=0.0, scale=1.0, size=None):
+    return np.zeros(size) if size is not None else 0.0
+
+
+def timed(func):
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func()
+    return result, (time.perf_counter() - start_time) / REPEATS
+
+
+# --- Exact parity: the scalar methods draw from np.random.normal, the engine from its own generator ---
+with mock.patch.object(np.random, "normal", no_noise):
+    exact_old = scalar_loop()
+exact_new = vectorized(ThermalEngine(noise=False))
+exact_diff = np.abs(exact_old - exact_new).max()
+assert exact_diff < 1e-9, f"❌ ThermalEngine drifts from the scalar physics by {exact_diff:.3g}°C without noise"
+assert np.array_equal(vectorized(ThermalEngine(seed=0)), vectorized(ThermalEngine(seed=0))), "❌ Seeded runs differ"
+
+old_result, old_time = timed(scalar_loop)
+new_result, new_time = timed(vectorized)
+
+# Both paths add measurement noise, so compare the trajectories statistically
+diff = np.abs(old_result - new_result)
+print(f"🔥 Configurations: {len(configs)}, hours: {HOURS}")
+print(f"🐢 Scalar calls:   {old_time * 1000:.2f} ms")
+print(f"⚡ ThermalEngine:  {new_time * 1000:.2f} ms")
+print(f"🚀 Speed-up: {old_time / new_time:.1f}x")
+print(f"✅ Without noise: max |Δ| {exact_diff:.2e}°C; seeded runs are identical")
+print(f"🔍 Noisy runs: mean |Δ| after {HOURS} h: {diff[:, -1].mean():.3f}°C, max |Δ| over the run: {diff.max():.3f}°C")
@@ -0,0 +1,151 @@
+# === bench_weather_parsing.py ===
+# Compares the previous pandas parser of an Open-Meteo response (row-wise weather code apply, 15-minute
+# radiation resample + merge, get_dummies) with the vectorized parse_forecast_response on a fake response
+# shaped like the real one (7 days hourly, 4 days of 15-minute radiation).
+# Run from the repository root: python BENCHMARKS/bench_weather_parsing.py
+
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from UTILS.weatherAPIRequest import (
+    parse_forecast_response, _map_weather_code_to_description, REQUIRED_WEATHER_DESC, ENERGY_COLUMNS,
+    FINAL_COLUMNS
+)
+
+HOURS = 24 * 7
+RADIATION_SLOTS = 4 * 24 * 4
+REPEATS = 50
+START = int(pd.Timestamp("2025-06-01", tz="Asia/Jerusalem").tz_convert("UTC").timestamp())
+
+
+# --- Fake response with the accessors the parsers use ---
+class FakeVariable:
+    def __init__(self, values):
+        self.values = values
+
+    def ValuesAsNumpy(self):
+        return self.values
+
+    def Value(self):
+        return self.values
+
+
+class FakeSeries:
+    def __init__(self, start, interval, variables):
+        self.start, self.interval, self.variables = start, interval, variables
+
+    def Time(self):
+        return self.start
+
+    def TimeEnd(self):
+        return self.start + self.interval * len(self.variables[0].values)
+
+    def Interval(self):
+        return self.interval
+
+    def Variables(self, i):
+        return self.variables[i]
+
+
+class FakeResponse:
+    def __init__(self, rng):
+        hourly = [rng.uniform(0, 40, HOURS).astype(np.float32) for _ in range(8)]
+        codes = rng.choice([0, 1, 2, 3, 4, 45, 51, 53, 55, 61, 63, 65, 80, 95], size=HOURS).astype(np.float32)
+        radiation = rng.uniform(0, 900, RADIATION_SLOTS).astype(np.float32)
+        radiation[rng.random(RADIATION_SLOTS) < 0.05] = np.nan
+        self.hourly = FakeSeries(START, 3600, [FakeVariable(v) for v in hourly + [codes]])
+        # Radiation starts 2 hours after the hourly grid and ends before it
+        self.minutely = FakeSeries(START + 2 * 3600, 900, [FakeVariable(radiation)])
+        self.current = FakeSeries(START, 0, [FakeVariable(np.float32(1012.5))])
+
+    def Hourly(self):
+        return self.hourly
+
+    def Minutely15(self):
+        return self.minutely
+
+    def Current(self):
+        return self.current
+
+
+def old_parser(response):
+    # Copy of the parsing part of the previous get_forecast_dataframe_for_model
+    current = response.Current()
+    surface_pressure = current.Variables(0).Value()
+
+    minutely = response.Minutely15()
+    rad_values = minutely.Variables(0).ValuesAsNumpy()
+    rad_times = pd.date_range(
+        start=pd.to_datetime(minutely.Time(), unit="s", utc=True),
+        end=pd.to_datetime(minutely.TimeEnd(), unit="s", utc=True),
+        freq=pd.Timedelta(seconds=minutely.Interval()),
+        inclusive="left"
+    )
+    rad_df = pd.DataFrame({"date": rad_times, "direct_radiation": rad_values})
+    rad_df["date"] = rad_df["date"].dt.tz_convert("Asia/Jerusalem")
+    rad_df = rad_df.resample("1h", on="date").mean().reset_index()
+
+    hourly = response.Hourly()
+    times = pd.date_range(
+        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
+        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
+        freq=pd.Timedelta(seconds=hourly.Interval()),
+        inclusive="left"
+    ).tz_convert("Asia/Jerusalem")
+
+    df = pd.DataFrame({
+        "date": times,
+        "temperature_2m": hourly.Variables(0).ValuesAsNumpy(),
+        "relative_humidity_2m": hourly.Variables(1).ValuesAsNumpy(),
+        "dew_point_2m": hourly.Variables(2).ValuesAsNumpy(),
+        "apparent_temperature": hourly.Variables(3).ValuesAsNumpy(),
+        "precipitation": hourly.Variables(4).ValuesAsNumpy(),
+        "cloud_cover": hourly.Variables(5).ValuesAsNumpy(),
+        "wind_speed_10m": hourly.Variables(6).ValuesAsNumpy(),
+        "is_day": hourly.Variables(7).ValuesAsNumpy(),
+        "surface_pressure": surface_pressure,
+        "weather_code": hourly.Variables(8).ValuesAsNumpy()
+    })
+    df["weather_description"] = df["weather_code"].apply(_map_weather_code_to_description)
+    df = pd.merge(df, rad_df, on="date", how="left")
+    df = pd.get_dummies(df, columns=["weather_description"])
+    for col in REQUIRED_WEATHER_DESC:
+        if col not in df.columns:
+            df[col] = 0.0
+    for col in ENERGY_COLUMNS:
+        df[col] = 0.0
+    return df.sort_values("date").reset_index(drop=True)
+
+
+def new_parser(response):
+    times, features = parse_forecast_response(response)
+    df = pd.DataFrame(features, columns=FINAL_COLUMNS)
+    df.insert(0, "date", times)
+    return df
+
+
+def timed(func, response):
+    start_time = time.perf_counter()
+    for _ in range(REPEATS):
+        result = func(response)
+    return result, (time.perf_counter() - start_time) / REPEATS
+
+
+response = FakeResponse(np.random.default_rng(0))
+old_df, old_time = timed(old_parser, response)
+new_df, new_time = timed(new_parser, response)
+
+old_features = old_df[FINAL_COLUMNS].to_numpy(dtype=np.float32)
+new_features = new_df[FINAL_COLUMNS].to_numpy()
+assert (old_df["date"] == new_df["date"]).all(), "❌ Hourly times differ"
+assert np.allclose(old_features, new_features, rtol=1e-5, equal_nan=True), "❌ Parsed features differ"
+
+print(f"🌤 Fake response: {HOURS} hourly rows, {RADIATION_SLOTS} radiation slots")
+print(f"🐢 pandas parser:     {old_time * 1000:.2f} ms")
+print(f"⚡ vectorized parser: {new_time * 1000:.2f} ms")
+print(f"🚀 Speed-up: {old_time / new_time:.1f}x")
+print("✅ Same feature matrix (float32, NaN where radiation is missing)")
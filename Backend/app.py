@@ -1,21 +1,29 @@
+import hashlib
 import json
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-from datetime import datetime
+from datetime import datetime, timedelta
 import pandas as pd
 import sys
 import os
 import time
+import tempfile
 import threading
 import requests
 from flask_jwt_extended import JWTManager, create_access_token,jwt_required
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from userRoutes import userApi, users_collection,db
 from DVCS.Boiler import BoilerManager
+from Backend.boilerRegistry import BoilerRegistry
+from Loader_Saver.sharedModel import shared_boiler_model, startup_report
 from flask import g
 from Backend.dailyStatsLogger import save_daily_summary
 from UTILS.emailSender import send_alert_to_logged_in_user
-from UTILS.weatherAPIRequest import get_forecast_dataframe_for_model
+from UTILS.forecastCache import (
+    get_forecast_dataframe_for_model, forecast_cache_stats, prefetch_forecasts, snap_to_cell, current_forecast_hour,
+    FORECAST_TTL_SECONDS, FORECAST_CACHE_SIZE
+)
+from UTILS.ttlCache import TTLCache
 if os.environ.get("RENDER") == "true":
     BACKEND_URL = "https://brightnest.onrender.com"
 else:
@@ -53,19 +61,118 @@ def handle_options():
 # === Register Blueprints ===
 app.register_blueprint(userApi)
 
-# === Global Boiler Instance ===
-boiler = BoilerManager(name="general", capacity_liters=100, has_solar=True)
+# === Shared Boiler Model ===
+# Scalers load here (in the gunicorn master with --preload), the LSTM on first use in each worker
+shared_boiler_model.preload()
+
+# === Per-user Boiler Registry ===
+BOILER_HISTORY_DIR = "boiler_history"
+os.makedirs(BOILER_HISTORY_DIR, exist_ok=True)
+
+boilers = BoilerRegistry(
+    factory=lambda user_id: BoilerManager(
+        name=str(user_id), capacity_liters=100, has_solar=True,
+        history_path=os.path.join(BOILER_HISTORY_DIR, f"{user_id}.save")
+    ),
+    on_evict=lambda boiler: boiler.temperature_history.flush(),
+    max_boilers=int(os.environ.get("MAX_BOILERS", 5000)),
+    idle_seconds=float(os.environ.get("BOILER_IDLE_SECONDS", 6 * 3600))
+)
+
+# === Cache for the /openmeteo route (JSON-ready forecasts of many locations) ===
+route_forecast_cache = TTLCache(
+    maxsize=int(os.environ.get("OPENMETEO_ROUTE_CACHE_SIZE", 256)),
+    ttl=FORECAST_TTL_SECONDS
+)
+
+# === Coalesced /boiler/schedule results ===
+# Identical concurrent schedule requests (same user, grid cell and payload) share one simulation, and
+# the result is reused for a short while; any action that changes the boiler state drops it.
+SCHEDULE_RESULT_TTL_SECONDS = float(os.environ.get("SCHEDULE_RESULT_TTL_SECONDS", 60))
+schedule_results = TTLCache(maxsize=int(os.environ.get("SCHEDULE_RESULT_CACHE_SIZE", 1024)),
+                            ttl=SCHEDULE_RESULT_TTL_SECONDS)
+
+
+def parse_schedule(schedule_data):
+    """
+    Turn the posted schedule ([{"datetime": iso, "preferredTemp": .., "name": ..}, ...]) into the
+    {datetime: details} dict the boiler simulation takes.
+    """
+    return {
+        datetime.fromisoformat(item["datetime"]): {
+            "shower_temp": float(item.get("preferredTemp", 38.0)),
+            "users": 1,
+            "name": item.get("name", "משתמש")
+        }
+        for item in schedule_data
+    }
+
+
+def schedule_payload(schedule_data, capacity, has_solar):
+    # Everything in a /boiler/schedule request besides the location that changes its result
+    return {"schedule": schedule_data, "boilerSize": capacity, "hasSolar": has_solar}
+
+
+def simulate_boiler_schedule(boiler, schedule_data, lat, lon, user_email=None):
+    """
+    Simulate a posted schedule on a leased boiler and remember it (with the location) for the midnight recompute.
+
+    Args:
+        schedule_data (list[dict]): the schedule as posted to /boiler/schedule
+        user_email (str | None): heating email recipient; None inside a request (taken from its token)
+
+    Returns:
+        pd.DataFrame | None: the per-shower recommendations
+    """
+    boiler.lat, boiler.lon, boiler.last_schedule = lat, lon, schedule_data
+    print(f"inject temp in schedule {boiler.last_static_temp}")
+    print(f"inject until in schedule {boiler.last_inject_until}")
+    df = boiler.simulate_day_usage_with_custom_temps(schedule=parse_schedule(schedule_data), lat=lat, lon=lon,
+                                                     export_csv=False, user_email=user_email)
+    print("after simulate")
+
+    boiler.temperature = boiler.load_forecasted_temp_from_prediction_file(
+        capacity_liters=boiler.capacity_liters,
+        has_solar=boiler.has_solar
+    )
+    print(f"📦 התחזית העדכנית לדוד: {boiler.temperature}°C")
+    return df
+
+
+def publish_schedule_records(df):
+    """
+    Save the recommendations where /boiler/recommendations reads them.
+
+    Returns:
+        list[dict]: the JSON-ready records
+    """
+    df["Time"] = df["Time"].astype(str)
+    records = df.to_dict(orient="records")
+    with open("latest_recommendations.json", "w") as f:
+        json.dump(records, f)
+    return records
+
+
+# Bumped on every boiler state change; part of the key, so a simulation still running on the old state
+# stores its result under a key no later request asks for
+_schedule_generations = {}
+_schedule_generations_lock = threading.Lock()
 
-# === Cache for Weather Forecast ===
-cached_forecast = None
-cached_location = None
-last_fetch_time = None
 
-static_lat=0.0
-static_lon=0.0
+def schedule_request_key(user_id, lat, lon, payload):
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+    with _schedule_generations_lock:
+        generation = _schedule_generations.get(user_id, 0)
+    return (user_id, generation, snap_to_cell(lat, lon), digest)
 
-static_new_temp = None
-static_inject_until = None
+
+def invalidate_schedule_results(user_id):
+    """
+    Call while holding the user's boiler lease, before changing its state.
+    """
+    with _schedule_generations_lock:
+        _schedule_generations[user_id] = _schedule_generations.get(user_id, 0) + 1
+    schedule_results.invalidate_where(lambda key: key[0] == user_id)
 
 
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
@@ -88,81 +195,101 @@ def home():
 
 @app.route("/openmeteo/<lat>/<lon>")
 def get_forecast(lat, lon):
-    global cached_forecast, cached_location, last_fetch_time
     try:
         latitude = float(lat)
         longitude = float(lon)
         now = datetime.utcnow()
 
-        static_lat = latitude
-        static_lon = longitude
-
-        if (cached_forecast and cached_location == (latitude, longitude) and
-            last_fetch_time and now.date() == last_fetch_time.date()):
-            return jsonify({
-                "location": {"latitude": latitude, "longitude": longitude, "requested_at": now.isoformat() + "Z", "cached": True},
-                "forecast": cached_forecast
-            })
+        # One entry per (grid cell, forecast hour); concurrent misses for a cell share one fetch
+        cell = snap_to_cell(latitude, longitude)
+        fetched = []
 
-        forecast_df, X_input = get_forecast_dataframe_for_model(latitude, longitude, hours_ahead=96)
-        full_df = pd.concat([forecast_df, X_input], axis=1)
-        full_df["date"] = pd.to_datetime(full_df["date"]).astype(str)
-        forecast_data = full_df.reset_index(drop=True).fillna(0).to_dict(orient="records")
+        def build_forecast():
+            fetched.append(True)
+            forecast_df, X_input = get_forecast_dataframe_for_model(cell[0], cell[1], hours_ahead=96)
+            full_df = pd.concat([forecast_df, X_input], axis=1)
+            full_df["date"] = pd.to_datetime(full_df["date"]).astype(str)
+            return full_df.reset_index(drop=True).fillna(0).to_dict(orient="records")
 
-        cached_forecast = forecast_data
-        cached_location = (static_lat, static_lon)
-        last_fetch_time = now
+        forecast_data = route_forecast_cache.get_or_compute((cell, current_forecast_hour()), build_forecast)
 
         return jsonify({
-            "location": {"latitude":static_lat, "longitude":static_lon, "requested_at": now.isoformat() + "Z", "cached": False},
+            "location": {"latitude": latitude, "longitude": longitude, "requested_at": now.isoformat() + "Z",
+                         "cached": not fetched},
             "forecast": forecast_data
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/openmeteo/cache-stats", methods=["GET"])
+def get_openmeteo_cache_stats():
+    return jsonify(route_forecast_cache.stats()), 200
+
+@app.route("/forecast/cache-stats", methods=["GET"])
+def get_forecast_cache_stats():
+    return jsonify(forecast_cache_stats()), 200
+
+@app.route("/boiler/registry-stats", methods=["GET"])
+def get_boiler_registry_stats():
+    return jsonify(boilers.stats()), 200
+
 @app.route("/boiler/status", methods=["POST"])
 @jwt_required()
 def update_boiler_status():
-    global boiler
     try:
         data = request.get_json() or {}
         new_status = data.get("status")
         if new_status not in ["on", "off"]:
             return jsonify({"error": "Invalid status value"}), 400
-        boiler.status = (new_status == "on")
-        print("boiler status: ", boiler.status)
-        return jsonify({"status": "on" if boiler.status else "off"}), 200
+        with boilers.lease(get_jwt_identity()) as boiler:
+            invalidate_schedule_results(get_jwt_identity())
+            boiler.status = (new_status == "on")
+            print("boiler status: ", boiler.status)
+            return jsonify({"status": "on" if boiler.status else "off"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @app.route("/boiler/status", methods=["GET"])
 @jwt_required()
 def get_boiler_status():
-    return jsonify({
-        "status": "on" if boiler.status else "off",
-        "temperature": boiler.get_temperature()
-    }), 200
+    with boilers.lease(get_jwt_identity()) as boiler:
+        return jsonify({
+            "status": "on" if boiler.status else "off",
+            "temperature": boiler.get_temperature()
+        }), 200
 
 @app.route("/boiler/temperature", methods=["GET"])
 @jwt_required()
 def get_boiler_temperature():
-    return jsonify({"temperature": boiler.get_temperature()}), 200
+    with boilers.lease(get_jwt_identity()) as boiler:
+        return jsonify({"temperature": boiler.get_temperature()}), 200
+
+@app.route("/boiler/temperature/history", methods=["GET"])
+@jwt_required()
+def get_boiler_temperature_history():
+    try:
+        hours = float(request.args.get("hours", 24))
+    except ValueError:
+        return jsonify({"error": "hours must be a number"}), 400
+    with boilers.lease(get_jwt_identity()) as boiler:
+        return jsonify({"hours": hours, "temperatures": boiler.get_temperature_history(hours)}), 200
 
 @app.route("/boiler/heat", methods=["POST"])
 @jwt_required()
 def heat_boiler():
     data = request.get_json()
     duration = float(data.get("duration", 30))
-    start_temp = float(data.get("start_temp", boiler.get_temperature()))
-    if not boiler.status:
-        return jsonify({"error": "Boiler is off"}), 400
-    final_temp = boiler.heat(duration_minutes=duration, start_temperature=start_temp)
-    return jsonify({"new_temperature": final_temp}), 200
+    with boilers.lease(get_jwt_identity()) as boiler:
+        start_temp = float(data.get("start_temp", boiler.get_temperature()))
+        if not boiler.status:
+            return jsonify({"error": "Boiler is off"}), 400
+        invalidate_schedule_results(get_jwt_identity())
+        final_temp = boiler.heat(duration_minutes=duration, start_temperature=start_temp)
+        return jsonify({"new_temperature": final_temp}), 200
 
 @app.route("/boiler/cool", methods=["POST"])
 @jwt_required()
 def cool_boiler():
-    global static_new_temp, static_inject_until
     user = get_jwt_identity()
     data = request.get_json()
 
@@ -186,34 +313,34 @@ def cool_boiler():
         return jsonify({"error": "Missing lat/lon coordinates"}), 400
 
 
-    current_temp = boiler.get_temperature() or 25.0
-    print(f"cool route - current temp:  {current_temp}")
+    with boilers.lease(user) as boiler:
+        invalidate_schedule_results(user)
+        current_temp = boiler.get_temperature() or 25.0
+        print(f"cool route - current temp:  {current_temp}")
 
+        static_new_temp, static_inject_until = boiler.cool(
+            schedule = schedule_data,
+            current_temp=current_temp,
+            used_liters=used_liters,
+            cold_water_temp=cold_temp,
+            lat=lat,
+            lon=lon
+        )
 
+        print(f"cool route - static_inject_until:  {static_inject_until}")
+        print(f"cool route - static_new_temp:  {static_new_temp}")
 
-    static_new_temp, static_inject_until = boiler.cool(
-        schedule = schedule_data,
-        current_temp=current_temp,
-        used_liters=used_liters,
-        cold_water_temp=cold_temp,
-        lat=lat,
-        lon=lon
-    )
-
-    print(f"cool route - static_inject_until:  {static_inject_until}")
-    print(f"cool route - static_new_temp:  {static_new_temp}")
-
-    boiler.last_inject_until = static_inject_until
-    boiler.last_static_temp = static_new_temp
+        boiler.last_inject_until = static_inject_until
+        boiler.last_static_temp = static_new_temp
 
-    boiler.simulate_day_usage_with_custom_temps(
-        schedule=schedule,
-        lat=lat,
-        lon=lon,
-        cold_temp=cold_temp,
-        liters_per_shower=used_liters,
-        export_csv=True,
-    )
+        boiler.simulate_day_usage_with_custom_temps(
+            schedule=schedule,
+            lat=lat,
+            lon=lon,
+            cold_temp=cold_temp,
+            liters_per_shower=used_liters,
+            export_csv=True,
+        )
 
     return jsonify({
         "message": "Boiler cooled and simulation continued",
@@ -255,41 +382,21 @@ def receive_schedule_and_respond():
         schedule_data = data.get("schedule", {})
         capacity = int(data.get("boilerSize", 100))
         has_solar = bool(data.get("hasSolar", True))
-        schedule = {
-            datetime.fromisoformat(item["datetime"]): {
-                "shower_temp": float(item.get("preferredTemp", 38.0)),
-                "users": 1,
-                "name": item.get("name", "משתמש")
-            }
-            for item in schedule_data
-        }
+        parse_schedule(schedule_data)  # reject a malformed schedule before taking the lease
         print(f"📍schedule_data {schedule_data}")
 
-        if boiler.name == "general":
-            boiler.name = "UserBoiler"
-            boiler.capacity_liters = capacity
-            boiler.has_solar = has_solar
-        print(f"inject temp in schedule {static_new_temp}")
-        print(f"inject until in schedule {static_inject_until}")
-        boiler.last_inject_until = static_inject_until
-        boiler.last_static_temp = static_new_temp
-        df = boiler.simulate_day_usage_with_custom_temps(schedule=schedule, lat=lat, lon=lon, export_csv=False)
-        print("after simulate")
-
-
-        boiler.temperature = boiler.load_forecasted_temp_from_prediction_file(
-            capacity_liters=boiler.capacity_liters,
-            has_solar=boiler.has_solar
-        )
-        print(f"📦 התחזית העדכנית לדוד: {boiler.temperature}°C")
+        user_id = get_jwt_identity()
+        key = schedule_request_key(user_id, lat, lon, schedule_payload(schedule_data, capacity, has_solar))
 
+        def run_schedule():
+            with boilers.lease(user_id) as boiler:
+                boiler.capacity_liters = capacity
+                boiler.has_solar = has_solar
+                df = simulate_boiler_schedule(boiler, schedule_data, lat, lon)
 
+            return publish_schedule_records(df)
 
-        df["Time"] = df["Time"].astype(str)
-        print("g")
-        with open("latest_recommendations.json", "w") as f:
-            json.dump(df.to_dict(orient="records"), f)
-        return jsonify(df.to_dict(orient="records"))
+        return jsonify(schedule_results.get_or_compute(key, run_schedule))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -347,18 +454,111 @@ def save_today_summary():
 
 
 
+def shift_schedule_to_day(schedule_data, day):
+    """
+    Move a posted schedule forward by whole days so its first shower falls on `day`; the days between showers
+    and their times of day are kept. Schedules that already start on or after `day` are returned unchanged.
+    """
+    dates = [datetime.fromisoformat(item["datetime"]).date() for item in schedule_data]
+    shift = (day - min(dates)).days if dates else 0
+    if shift <= 0:
+        return schedule_data
+    # Only the date part of the ISO string changes, so the payload keeps the client's format
+    return [
+        {**item, "datetime": (date + timedelta(days=shift)).isoformat() + item["datetime"][10:]}
+        for item, date in zip(schedule_data, dates)
+    ]
+
+
+def recompute_household_schedules():
+    """
+    Midnight recompute of every household this process holds a boiler for.
+
+    Households are grouped by forecast grid cell; the weather of up to FORECAST_CACHE_SIZE cells is fetched
+    in one bulk call (a few batched Open-Meteo requests), then each household's last schedule is moved to the
+    new day and simulated against the warm forecast cache. Results are published like /boiler/schedule ones:
+    latest_recommendations.json, the forecast prediction file and the schedule result cache.
+    """
+    by_cell = {}
+    for user_id, boiler in boilers.items():
+        if boiler.last_schedule and boiler.lat is not None and boiler.lon is not None:
+            by_cell.setdefault(snap_to_cell(boiler.lat, boiler.lon), []).append(user_id)
+
+    cells = list(by_cell)
+    today = datetime.now().date()
+    recomputed = 0
+    with app.app_context():
+        for i in range(0, len(cells), FORECAST_CACHE_SIZE):
+            chunk = cells[i:i + FORECAST_CACHE_SIZE]
+            prefetch_forecasts(chunk)
+            for user_id in (user_id for cell in chunk for user_id in by_cell[cell]):
+                try:
+                    with boilers.lease(user_id) as boiler:
+                        if not boiler.last_schedule:
+                            continue  # evicted and recreated since the snapshot
+                        invalidate_schedule_results(user_id)
+                        schedule_data = shift_schedule_to_day(boiler.last_schedule, today)
+                        # Keyed like the request that would ask for this schedule, under the new generation
+                        key = schedule_request_key(user_id, boiler.lat, boiler.lon, schedule_payload(
+                            schedule_data, boiler.capacity_liters, boiler.has_solar
+                        ))
+                        df = simulate_boiler_schedule(boiler, schedule_data, boiler.lat, boiler.lon,
+                                                      user_email=user_id)
+
+                    if df is None or df.empty:
+                        print(f"⚠ Midnight recompute produced no recommendations for {user_id}")
+                        continue
+                    schedule_results.set(key, publish_schedule_records(df))
+                    recomputed += 1
+                except Exception as e:
+                    print(f"❌ Midnight recompute failed for {user_id}: {e}")
+
+    print(f"🌙 Recomputed {recomputed} household schedules in {len(cells)} grid cells")
+
+
 def run_nightly_schedule():
     def job():
         while True:
             now = datetime.now()
             if now.hour == 0 and now.minute == 0:
                 try:
-                    requests.post(f"{BACKEND_URL}/boiler/schedule")
+                    recompute_household_schedules()
                 except Exception as e:
                     print("❌ Midnight job failed:", e)
             time.sleep(60)
     threading.Thread(target=job, daemon=True).start()
 
+
+NIGHTLY_LOCK_PATH = os.environ.get("NIGHTLY_LOCK_PATH", os.path.join(tempfile.gettempdir(), "brightnest-nightly.lock"))
+_nightly_lock_file = None
+
+
+def start_nightly_schedule_once() -> bool:
+    """
+    Start the midnight job unless another gunicorn worker already runs it (called from post_fork).
+
+    The worker that takes an exclusive lock on NIGHTLY_LOCK_PATH keeps it until it exits; a worker
+    respawned after it takes the job over.
+
+    Returns:
+        bool: True if this process runs the job
+    """
+    global _nightly_lock_file
+    import fcntl  # gunicorn only runs on Unix
+
+    lock_file = open(NIGHTLY_LOCK_PATH, "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _nightly_lock_file = lock_file
+    run_nightly_schedule()
+    print(f"🌙 Midnight recompute runs in process {os.getpid()}")
+    return True
+
 if __name__ == "__main__":
+    shared_boiler_model.get()
+    startup_report("dev server")
     run_nightly_schedule()
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class _BoilerEntry:
+    def __init__(self, boiler=None):
+        self.boiler = boiler
+        self.ready = threading.Event()  # set once the factory returned (or failed)
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.last_used = time.monotonic()
+
+
+class BoilerRegistry:
+    """
+    Keeps one BoilerManager per user so households never share boiler state.
+
+    Boilers are created on first use by `factory(user_id)` outside the registry lock (after any pending
+    flush of the same user's evicted boiler), serialized per user with their own lock, and evicted after `idle_seconds` without requests or when more than `max_boilers` are held
+    (least recently used first, never while a request is using them).
+
+    Args:
+        factory (callable): builds a new boiler for a user id
+        max_boilers (int): upper bound of boilers kept in this process
+        idle_seconds (float): idle time after which a boiler is dropped
+        on_evict (callable | None): called with each evicted boiler (e.g. to flush its state)
+    """
+
+    def __init__(self, factory, max_boilers: int = 5000, idle_seconds: float = 6 * 3600, on_evict=None):
+        self.factory = factory
+        self.on_evict = on_evict
+        self.max_boilers = max_boilers
+        self.idle_seconds = idle_seconds
+        self._entries = OrderedDict()  # user_id -> _BoilerEntry, least recently used first
+        self._flushing = {}  # user_id -> Event set when on_evict of that user's evicted boiler returned
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    @contextmanager
+    def lease(self, user_id):
+        """
+        Yield the user's boiler while holding its lock for the whole request.
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            building = entry is None
+            if building:
+                # Placeholder: concurrent leases of this user wait for the boiler built below
+                entry = _BoilerEntry()
+                self._entries[user_id] = entry
+                self.created += 1
+            flushing = self._flushing.get(user_id) if building else None
+            self._entries.move_to_end(user_id)
+            entry.in_use += 1
+            entry.last_used = time.monotonic()
+            evicted = self._evict_locked()
+
+        try:
+            self._notify_evicted(evicted)
+            if building:
+                self._build(user_id, entry, flushing)
+            entry.ready.wait()
+            if entry.boiler is None:
+                raise RuntimeError(f"❌ Could not create the boiler of {user_id}")
+            with entry.lock:
+                yield entry.boiler
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.monotonic()
+
+    def _build(self, user_id, entry, flushing):
+        try:
+            if flushing is not None:
+                flushing.wait()  # the factory loads the snapshot the evicted boiler is still writing
+            entry.boiler = self.factory(user_id)
+        except Exception:
+            with self._lock:
+                if self._entries.get(user_id) is entry:
+                    del self._entries[user_id]
+            raise
+        finally:
+            entry.ready.set()
+
+    def evict_idle(self):
+        with self._lock:
+            evicted = self._evict_locked()
+        self._notify_evicted(evicted)
+
+    def _evict_locked(self) -> list:
+        """
+        Drop idle / over-capacity entries. Must hold self._lock; returns (user_id, boiler, flushed event) of
+        the evicted boilers so on_evict (file I/O) can run after the lock is released.
+        """
+        now = time.monotonic()
+        evicted = []
+        for user_id in list(self._entries):
+            entry = self._entries[user_id]
+            too_many = len(self._entries) > self.max_boilers
+            idle = now - entry.last_used >= self.idle_seconds
+            if not too_many and not idle:
+                break  # entries are ordered by last use, the rest are newer
+            if entry.in_use:
+                continue
+            del self._entries[user_id]
+            self.evicted += 1
+            if self.on_evict is not None:
+                flushed = self._flushing[user_id] = threading.Event()
+                evicted.append((user_id, entry.boiler, flushed))
+        return evicted
+
+    def _notify_evicted(self, evicted):
+        for user_id, boiler, flushed in evicted:
+            try:
+                self.on_evict(boiler)
+            except Exception as e:
+                print(f"❌ Flushing the evicted boiler of {user_id} failed: {e}")
+            finally:
+                with self._lock:
+                    if self._flushing.get(user_id) is flushed:
+                        del self._flushing[user_id]
+                flushed.set()
+
+    def items(self) -> list:
+        """
+        Snapshot of (user_id, boiler) pairs currently held, for fleet-wide jobs. The boilers are not leased:
+        lease() a user before changing their boiler.
+        """
+        with self._lock:
+            return [(user_id, entry.boiler) for user_id, entry in self._entries.items() if entry.boiler is not None]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "boilers": len(self._entries),
+                "max_boilers": self.max_boilers,
+                "idle_seconds": self.idle_seconds,
+                "created": self.created,
+                "evicted": self.evicted
+            }
@@ -0,0 +1,15 @@
+# === gunicorn.conf.py ===
+# Load app.py (and the shared model scalers) once in the master, then fork the workers.
+
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Each worker builds its own Keras graph (TensorFlow is not fork-safe) and reports its cost
+    from Loader_Saver.sharedModel import shared_boiler_model, startup_report
+    shared_boiler_model.get()
+    startup_report(f"worker {worker.age}")
+
+    # One worker (the first to take the lock file) runs the midnight recompute
+    from app import start_nightly_schedule_once
+    start_nightly_schedule_once()
@@ -1,15 +1,22 @@
 # ==== Imports ====
 import json
+import hashlib
 
 scheduled_email_times = set()
 
 import joblib
 import pytz
 from sympy.physics.units import temperature
-from tensorflow.keras.models import load_model
 from datetime import datetime, timedelta
-import UTILS.weatherAPIRequest as weather
+import UTILS.forecastCache as forecast_cache
 from DVCS.Device import Device
+from DVCS.TemperatureHistory import TemperatureHistory
+from DVCS.HeatingCurve import HeatingCurve
+from DVCS.WeatherWindow import get_shared_weather_window
+from UTILS.sequenceBuilder import sliding_windows
+from DVCS.ThermalEngine import (ThermalEngine, WATER_DENSITY, WATER_HEAT_CAPACITY, SOLAR_EFFICIENCY, COLLECTOR_AREA,
+                                INSULATION_K, INSULATION_THICKNESS, MIN_EFFECTIVE_RADIATION, MAX_COOLING_PER_HOUR,
+                                COLLECTOR_EFFICIENCY_PER_SIZE)
 import numpy as np
 import os
 import pandas as pd
@@ -17,6 +24,8 @@ import threading
 import requests
 from flask import current_app, jsonify, request, g
 from UTILS.emailSender import schedule_heating_email, send_alert_to_logged_in_user
+from UTILS.ttlCache import TTLCache
+from Loader_Saver.sharedModel import shared_boiler_model
 
 
 
@@ -25,28 +34,37 @@ BOILER_SIZES = [50, 100, 150]
 MAX_TEMP_NO_SOLAR = 50
 chunk_size = 100000
 
-# Physical constants
-WATER_DENSITY = 1  # kg/L
-WATER_HEAT_CAPACITY = 4.18  # kJ/kg°C
-SOLAR_EFFICIENCY = 0.70
-COLLECTOR_AREA = 3.0  # m²
-INSULATION_K = 0.035
-INSULATION_THICKNESS = 0.05  # m
-MIN_EFFECTIVE_RADIATION = 100
-MAX_COOLING_PER_HOUR = 0.8
-
-# Efficiency by boiler size
-COLLECTOR_EFFICIENCY_PER_SIZE = {
-    50: 1.0,
-    100: 0.85,
-    150: 0.75
+# Column of the 6-hour model input window holding each boiler type's previous temperature
+PREV_TEMP_COLUMNS = {
+    (50, True): "prev_boiler_temp_50_solar",
+    (50, False): "prev_boiler_temp_50_no_solar",
+    (100, True): "prev_boiler_temp_100_solar",
+    (100, False): "prev_boiler_temp_100_no_solar",
+    (150, True): "prev_boiler_temp_150_solar",
+    (150, False): "prev_boiler_temp_150_no_solar",
 }
 
+# Model forecasts only depend on the weather input and the model, so they are shared by every boiler
+MODEL_FORECAST_CACHE_SIZE = 512
+_model_forecast_cache = TTLCache(maxsize=MODEL_FORECAST_CACHE_SIZE, ttl=forecast_cache.FORECAST_TTL_SECONDS)
+_last_saved_forecast_key = None
+
+
+def clear_model_forecast_cache():
+    global _last_saved_forecast_key
+    _model_forecast_cache.clear()
+    _last_saved_forecast_key = None
+
+
+def model_forecast_cache_stats() -> dict:
+    return _model_forecast_cache.stats()
+
 
 
 # ==== Boiler Initialization ====
 class BoilerManager(Device):
-    def __init__(self, name: str, capacity_liters: int,  has_solar: bool = True, power_usage: float = None):
+    def __init__(self, name: str, capacity_liters: int,  has_solar: bool = True, power_usage: float = None,
+                 history_path: str = "scale_temperature_list.save", seed=None):
         if power_usage is None:
             power_map = {50: 2.0, 100: 3.0, 150: 4.0}
             power_usage = power_map.get(capacity_liters, 3.0)
@@ -55,11 +73,8 @@ class BoilerManager(Device):
         self.capacity_liters = capacity_liters
         self.has_solar = has_solar
         self.temperature = 25
-
-        self.model = load_model("boiler_temperature_multitarget_lstm6h.h5", compile=False)
-        self.scaler_x = joblib.load("scaler_x.save")
-        self.scaler_y = joblib.load("scaler_y.save")
-        self.expected_features = list(self.scaler_x.feature_names_in_)
+        self.temperature_history = TemperatureHistory(capacity=24, path=history_path)
+        self.thermal_engine = ThermalEngine(seed=seed)  # seed: reproducible natural-heating injections
 
         self.target_columns = [
             "boiler temp for 50 L with solar system",
@@ -71,63 +86,73 @@ class BoilerManager(Device):
         ]
         self.lat = None
         self.lon = None
+        self.last_schedule = None  # last schedule posted to /boiler/schedule, replayed by the midnight recompute
 
         self.natural_heating_forecast = {}
         self.last_static_temp = None
         self.last_inject_until = None
 
+    # The LSTM and scalers are loaded once per process and shared by every boiler
+    @property
+    def model(self):
+        return shared_boiler_model.get().model
+
+    @property
+    def scaler_x(self):
+        return shared_boiler_model.get().scaler_x
+
+    @property
+    def scaler_y(self):
+        return shared_boiler_model.get().scaler_y
+
+    @property
+    def expected_features(self):
+        return shared_boiler_model.get().expected_features
+
+    @property
+    def model_version(self):
+        return shared_boiler_model.get().version
+
+    def reload_model(self):
+        """
+        Reload the LSTM and scalers from disk and drop every cached model forecast.
+        """
+        shared_boiler_model.reload()
+        clear_model_forecast_cache()
+        print(f"🔄 Model reloaded (version {self.model_version}), forecast cache cleared.")
 
     def update_boiler_temperature(self, new_temp: float):
         self.temperature = round(new_temp, 2)
-        scale_path = "scale_temperature_list.save"
-        scale = joblib.load(scale_path) if os.path.exists(scale_path) else []
-        scale.append(self.temperature)
-        if len(scale) > 24:
-            scale.pop(0)
-        joblib.dump(scale, scale_path)
+        self.temperature_history.append(self.temperature)
 
         try:
-            csv_path = "last_6_hours_weather.csv"
-            # === Fallback: create CSV if it doesn't exist
-            if not os.path.exists(csv_path):
-                print("📄 Creating last_6_hours_weather.csv from live forecast...")
+            window = get_shared_weather_window()
+            # === Fallback: build the window from the live forecast if there is none yet
+            if window.is_empty():
+                print("📄 Creating the 6-hour weather window from live forecast...")
                 try:
-                    from UTILS import weatherAPIRequest as weather
-                    forecast_df, input_df = weather.get_forecast_dataframe_for_model(
+                    forecast_df, input_df = forecast_cache.get_forecast_dataframe_for_model(
                         lat=self.lat,
                         lon=self.lon,
                         hours_ahead=6
                     )
-                    combined = forecast_df.copy()
-                    for col in input_df.columns:
-                        combined[col] = input_df[col]
-                    combined.to_csv(csv_path, index=False)
-                    print("✅ Forecast CSV created.")
+                    window.replace(forecast_df["date"], input_df)
+                    print("✅ Forecast window created.")
                 except Exception as e:
-                    print(f"❌ Failed to create forecast CSV: {e}")
+                    print(f"❌ Failed to create forecast window: {e}")
                     return
 
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path)
-                idx = df.index[-1]
-                update_map = {
-                    (50, True): "prev_boiler_temp_50_solar",
-                    (50, False): "prev_boiler_temp_50_no_solar",
-                    (100, True): "prev_boiler_temp_100_solar",
-                    (100, False): "prev_boiler_temp_100_no_solar",
-                    (150, True): "prev_boiler_temp_150_solar",
-                    (150, False): "prev_boiler_temp_150_no_solar",
-                }
-                key = (self.capacity_liters, self.has_solar)
-                column = update_map.get(key)
-                if column and column in df.columns:
-                    df.loc[idx, column] = self.temperature
-                    df.to_csv(csv_path, index=False)
-                    print(f"✅ Updated {column} in real-time CSV.")
-                else:
-                    print(f"⚠ Column for {key} not found in CSV.")
+            self._update_weather_window(self.temperature)
         except Exception as e:
-            print(f"⚠ Failed to update CSV with real-time temp: {e}")
+            print(f"⚠ Failed to update weather window with real-time temp: {e}")
+
+    def _update_weather_window(self, temp: float):
+        key = (self.capacity_liters, self.has_solar)
+        column = PREV_TEMP_COLUMNS.get(key)
+        if column and get_shared_weather_window().set_latest(column, temp):
+            print(f"✅ Updated {column} in real-time weather window.")
+        else:
+            print(f"⚠ Column for {key} not found in weather window.")
 
     def heat(self, duration_minutes: float, start_temperature: float):
         """
@@ -150,13 +175,6 @@ class BoilerManager(Device):
         current_temp = start_temperature
         remaining_time = duration_minutes
 
-        # Load or initialize scale
-        scale_path = "scale_temperature_list.save"
-        if os.path.exists(scale_path):
-            scale = joblib.load(scale_path)
-        else:
-            scale = []
-
         # Heating loop
         while remaining_time > 0 and current_temp < MAX_TEMP:
             step = min(60, remaining_time)
@@ -165,48 +183,30 @@ class BoilerManager(Device):
             current_temp = min(current_temp + delta_T, MAX_TEMP)
             remaining_time -= step
 
-            scale.append(round(current_temp, 2))
-            if len(scale) > 24:
-                scale.pop(0)
+            self.temperature_history.append(current_temp)
 
             print(f"{self.name}: +{step:.0f} min → ΔT = {delta_T:.2f}°C → Temp = {current_temp:.1f}°C")
 
-        joblib.dump(scale, scale_path)
         self.temperature = current_temp
 
-        # Update CSV for real-time models
+        # Update the in-memory window for real-time models
         try:
-            csv_path = "last_6_hours_weather.csv"
-            if os.path.exists(csv_path):
-                df = pd.read_csv(csv_path)
-                idx = df.index[-1]
-
-                update_map = {
-                    (50, True): "prev_boiler_temp_50_solar",
-                    (50, False): "prev_boiler_temp_50_no_solar",
-                    (100, True): "prev_boiler_temp_100_solar",
-                    (100, False): "prev_boiler_temp_100_no_solar",
-                    (150, True): "prev_boiler_temp_150_solar",
-                    (150, False): "prev_boiler_temp_150_no_solar",
-                }
-
-                key = (self.capacity_liters, self.has_solar)
-                column = update_map.get(key)
-
-                if column and column in df.columns:
-                    df.loc[idx, column] = round(current_temp, 2)
-                    df.to_csv(csv_path, index=False)
-                    print(f"✅ Updated {column} in real-time CSV.")
-                else:
-                    print(f"⚠ Column for {key} not found in CSV.")
+            if not get_shared_weather_window().is_empty():
+                self._update_weather_window(round(current_temp, 2))
         except Exception as e:
-            print(f"⚠ Failed to update CSV with real-time temp: {e}")
+            print(f"⚠ Failed to update weather window with real-time temp: {e}")
 
         return current_temp
 
     def get_temperature(self):
         return self.temperature
 
+    def get_temperature_history(self, hours: float = 24):
+        """
+        Boiler temperatures recorded during the last `hours` hours, oldest first.
+        """
+        return self.temperature_history.last_hours(hours)
+
     def str(self):
         solar = "with solar" if self.has_solar else "without solar"
         return f"Boiler '{self.name}' ({self.capacity_liters}L, {solar}) - {self.get_status()}, {self.temperature:.1f}°C"
@@ -275,38 +275,96 @@ class BoilerManager(Device):
                 - datetime to begin heating (or None if not required / not possible)
                 - forecasted boiler temp at that time
         """
+        return self.calc_start_heating_times(forecast_df, boiler_key, [(target_time, target_temp)])[0]
+
+    def calc_start_heating_times(self, forecast_df: pd.DataFrame, boiler_key: str, targets: list):
+        """
+        Vectorized calc_start_heating_time for a whole schedule.
+
+        For every (shower, forecast row) pair the heating minutes needed from that row's forecasted
+        temperature are computed at once. For each shower the answer comes from the latest row before
+        the shower that is either hot enough already or leaves enough time to heat, the same row the
+        backwards scan of the scalar version stops at.
+
+        Args:
+            forecast_df (pd.DataFrame): forecast with a naive "time" column and boiler_key temperatures
+            boiler_key (str): forecast column of this boiler type
+            targets (list[(datetime, float)]): (shower time, wanted temperature) pairs
+
+        Returns:
+            list[(datetime | None, float | None)]: one (heating start, forecasted temp) pair per target
+        """
+        if not targets:
+            return []
+        if any(getattr(t, "tzinfo", None) is not None for t, _ in targets):
+            raise TypeError("can't compare offset-naive forecast times and offset-aware shower times")
+
         c = 4.186  # Specific heat capacity of water (kJ/kg°C)
         mass_kg = self.capacity_liters
         power_kj_per_min = self.power_usage * 1000 / 60  # kW to kJ/min
         efficiency = 0.9  # Heating efficiency
 
-        # Filter forecast only for times before the shower
-        relevant_forecast = forecast_df[
-            (forecast_df["time"] <= target_time)
-        ].sort_values("time", ascending=False)
-
-        for _, row in relevant_forecast.iterrows():
-            forecast_time = row["time"]
-            temp_now = row[boiler_key]
+        # Forecast sorted by time once for the whole schedule
+        times = forecast_df["time"].to_numpy(dtype="datetime64[us]")
+        temps_raw = forecast_df[boiler_key].to_numpy()
+        order = np.argsort(times, kind="stable")
+        times, temps_raw = times[order], temps_raw[order]
+        temps = temps_raw.astype(np.float64)
+
+        target_times = np.array([np.datetime64(t, "us") for t, _ in targets])
+        target_temps = np.array([temp for _, temp in targets], dtype=np.float64)
+
+        # (showers, rows) heating need, in minutes and in whole microseconds like timedelta()
+        delta_T = target_temps[:, None] - temps[None, :]
+        minutes_needed = mass_kg * c * delta_T / (power_kj_per_min * efficiency)
+        with np.errstate(invalid="ignore"):
+            start_times = target_times[:, None] - np.rint(np.nan_to_num(minutes_needed) * 60e6).astype("timedelta64[us]")
+
+        # Rows at or before each shower, found with one binary search per shower
+        rows_before = np.searchsorted(times, target_times, side="right")
+        in_window = np.arange(len(times))[None, :] < rows_before[:, None]
+        stop = in_window & ~np.isnan(delta_T) & ((delta_T <= 0) | (start_times >= times[None, :]))
+
+        # Latest stopping row per shower (the scalar version scans backwards from the shower)
+        found = stop.any(axis=1)
+        latest = stop.shape[1] - 1 - np.argmax(stop[:, ::-1], axis=1)
+
+        results = []
+        for i, (target_time, _) in enumerate(targets):
+            if not found[i]:
+                # No time window in the forecast allows to reach target temperature
+                results.append((None, None))
+                continue
+            k = latest[i]
+            if delta_T[i, k] <= 0:
+                # Already hot enough – no heating required
+                results.append((None, temps_raw[k]))
+            else:
+                results.append((target_time - timedelta(minutes=float(minutes_needed[i, k])), temps_raw[k]))
+        return results
 
-            delta_T = target_temp - temp_now
+    def predict_forecast_windows(self, l_input: pd.DataFrame, seq_len: int = 6) -> np.ndarray:
+        """
+        Runs the LSTM over every seq_len-hour window of the model input in a single batched call.
 
-            if delta_T <= 0:
-                # Already hot enough – no heating required
-                return None, temp_now
+        The input is scaled once (MinMaxScaler is element-wise, so this matches scaling each window),
+        the windows are taken as a strided view of the scaled matrix (the same builder training uses)
+        and inverse scaling is done once for the whole batch.
 
-            # Compute energy and time required to heat from temp_now to target_temp
-            energy_needed_kj = mass_kg * c * delta_T
-            time_needed_minutes = energy_needed_kj / (power_kj_per_min * efficiency)
+        Args:
+            l_input (pd.DataFrame): model features, ordered as self.expected_features
+            seq_len (int): window length in hours
 
-            heating_start_time = target_time - timedelta(minutes=time_needed_minutes)
+        Returns:
+            np.ndarray: (len(l_input) - seq_len + 1, 6) boiler temperatures, one row per window start
+        """
+        scaled = self.scaler_x.transform(l_input)
 
-            # Check if there is enough time before the forecast_time to heat
-            if heating_start_time >= forecast_time:
-                return heating_start_time, temp_now
+        # (N, seq_len, F) view, no copy until predict needs contiguous memory
+        windows, _ = sliding_windows(scaled, seq_len)
 
-        # No time window in the forecast allows to reach target temperature
-        return None, None
+        y_pred_scaled = self.model.predict_on_batch(np.ascontiguousarray(windows))
+        return self.scaler_y.inverse_transform(np.asarray(y_pred_scaled))
 
     def simulate_day_usage_with_custom_temps(self, schedule: dict,
                                              lat: float, lon: float,
@@ -314,9 +372,22 @@ class BoilerManager(Device):
                                              liters_per_shower: float = 40.0,
                                              export_csv: bool = True,
                                              filename: str = "daily_usage_log_custom_temp.csv",
-                                             save_forecast_json: bool = True):
+                                             save_forecast_json: bool = True,
+                                             user_email: str = None):
+        """
+        Forecast the boiler temperature for every shower in the schedule and recommend when to heat.
+
+        Args:
+            user_email (str | None): who gets the heating emails. None = take it from the current request
+                (Authorization header + g.user); pass it to run outside a request, e.g. from a background
+                job under app.app_context()
+
+        Returns:
+            pd.DataFrame: one recommendation row per shower
+        """
+        global _last_saved_forecast_key
 
-        l_forecast, l_input = weather.get_forecast_dataframe_for_model(
+        l_forecast, l_input = forecast_cache.get_forecast_dataframe_for_model(
             lat=lat, lon=lon, hours_ahead=48
         )
 
@@ -346,18 +417,27 @@ class BoilerManager(Device):
 
         l_input = l_input[self.expected_features].astype(np.float32)
 
-        forecast_temps, time_stamps = [], []
-        for i in range(len(l_input) - 5):
-            sequence = l_input.iloc[i:i + 6]
-            X = np.expand_dims(self.scaler_x.transform(sequence), axis=0)
-            y_pred_scaled = self.model.predict(X, verbose=0)
-            y_pred = self.scaler_y.inverse_transform(y_pred_scaled)[0]
-            forecast_temps.append(y_pred)
-            time_stamps.append(l_forecast["date"].iloc[i])
+        # Same model, grid cell and forecast issue hour -> same LSTM output, whatever the boiler
+        forecast_key = hashlib.sha256(repr((
+            self.model_version,
+            forecast_cache.snap_to_cell(lat, lon),
+            forecast_cache.current_forecast_hour().isoformat()
+        )).encode()).hexdigest()
+
+        cached_forecast = _model_forecast_cache.get(forecast_key)
+        if cached_forecast is None:
+            forecast_temps = self.predict_forecast_windows(l_input)
+            time_stamps = l_forecast["date"].iloc[:len(forecast_temps)].tolist()
+
+            cached_forecast = pd.DataFrame(forecast_temps, columns=self.target_columns)
+            cached_forecast.insert(0, "time", time_stamps)
+            cached_forecast["time"] = pd.to_datetime(cached_forecast["time"]).dt.tz_localize(None)
+            _model_forecast_cache.set(forecast_key, cached_forecast)
+        else:
+            print("♻️ Using cached model forecast")
 
-        df_forecast = pd.DataFrame(forecast_temps, columns=self.target_columns)
-        df_forecast.insert(0, "time", time_stamps)
-        df_forecast["time"] = pd.to_datetime(df_forecast["time"]).dt.tz_localize(None)
+        df_forecast = cached_forecast.copy()
+        injected = False
 
         if self.last_static_temp is not None and self.last_inject_until is not None:
             jerusalem = pytz.timezone("Asia/Jerusalem")
@@ -377,52 +457,55 @@ class BoilerManager(Device):
                 print("🔍 First forecast time in df_forecast:", df_forecast["time"].iloc[0])
                 print("🕒 Last inject start:", self.last_inject_until - timedelta(hours=6))
 
-                for idx, row in df_forecast.iterrows():
-                    forecast_time = row["time"]
-                    # ⭐ הפוך אותו ל־tz-aware
-                    if forecast_time.tzinfo is None:
-                        forecast_time = pytz.timezone("Asia/Jerusalem").localize(forecast_time)
-
-                    if forecast_time > self.last_inject_until:
-                        print("in if")
-                        break
-
-                    if idx == 0:
-                        df_forecast.at[idx, key] = np.float32(current_temp)
-                        continue
-
-
-                    mask = l_forecast["date"] == forecast_time
-                    print(f"forecast time: {forecast_time}")
-
-                    if not mask.any():
-                        continue
-
-                    ambient = l_input.loc[mask, "temperature_2m"].values[0]
-                    radiation = l_input.loc[mask, "direct_radiation"].values[0]
-                    cloud = l_input.loc[mask, "cloud_cover"].values[0]
-                    wind = l_input.loc[mask, "wind_speed_10m"].values[0]
-                    hour = forecast_time.hour
-                    month = forecast_time.month
-
-
-                    if self.has_solar:
-                        current_temp = self.compute_solar_heating(
-                            prev_temp=current_temp,
-                            radiation=radiation,
-                            cloud_cover=cloud,
-                            hour=hour,
-                            month=month,
-                            volume_liters=self.capacity_liters
-                        )
-
-                    current_temp = round(current_temp, 2)
-                    df_forecast.at[idx, key] = np.float32(current_temp)
+                # Align the weather inputs to the forecast rows once through the time index
+                forecast_times = df_forecast["time"]
+                if forecast_times.dt.tz is None:
+                    # ⭐ הפוך אותו ל־tz-aware (ambiguous hours resolve like pytz localize(is_dst=False))
+                    forecast_times = forecast_times.dt.tz_localize(
+                        "Asia/Jerusalem", ambiguous=np.zeros(len(forecast_times), dtype=bool),
+                        nonexistent="shift_forward"
+                    )
+                forecast_times = pd.DatetimeIndex(forecast_times).tz_convert("UTC")
+
+                # Forecast rows are in time order: inject every row up to the end of the inject window
+                after_window = forecast_times > self.last_inject_until
+                n_inject = int(after_window.argmax()) if after_window.any() else len(forecast_times)
+
+                if n_inject > 0:
+                    df_forecast.iloc[0, df_forecast.columns.get_loc(key)] = np.float32(current_temp)
+
+                weather_dates = pd.DatetimeIndex(l_forecast["date"]).tz_convert("UTC")
+                first_occurrence = ~weather_dates.duplicated()
+                weather = l_input.loc[first_occurrence, ["temperature_2m", "direct_radiation",
+                                                         "cloud_cover", "wind_speed_10m"]].to_numpy(dtype=np.float64)
+                weather_pos = weather_dates[first_occurrence].get_indexer(forecast_times[1:n_inject])
+
+                # Rows without matching weather keep the model forecast
+                inject_rows = np.flatnonzero(weather_pos >= 0) + 1
+                if len(inject_rows):
+                    weather = weather[weather_pos[weather_pos >= 0]]
+                    local_times = forecast_times[inject_rows].tz_convert("Asia/Jerusalem")
+                    trajectory = self.thermal_engine.simulate(
+                        start_temps=current_temp,
+                        volumes=self.capacity_liters,
+                        has_solar=self.has_solar,
+                        radiation=weather[:, 1],
+                        cloud_cover=weather[:, 2],
+                        ambient_temp=weather[:, 0],
+                        wind_speed=weather[:, 3],
+                        hours=local_times.hour.to_numpy(),
+                        months=local_times.month.to_numpy(),
+                        round_decimals=2
+                    )[0]
+                    df_forecast.iloc[inject_rows, df_forecast.columns.get_loc(key)] = trajectory.astype(np.float32)
+
+                injected = True
 
                 print(
                     f"✅ Natural temp simulation completed → up to {self.last_inject_until.strftime('%Y-%m-%d %H:%M')}")
 
-        if save_forecast_json:
+        if save_forecast_json and (injected or forecast_key != _last_saved_forecast_key):
+            _last_saved_forecast_key = None if injected else forecast_key
             print("saving JSON")
             forecast_json_path = os.path.join(os.getcwd(), "forecast_prediction.json")
             df_forecast.to_json(forecast_json_path, orient="records", force_ascii=False, indent=2, date_format="iso")
@@ -435,6 +518,18 @@ class BoilerManager(Device):
         log = []
         print(f"\n📅 Simulating daily usage with per-user temperatures: {schedule}")
 
+        # Heating start times for every well-formed shower in one vectorized pass
+        batch_targets = [
+            (target_time, details.get("shower_temp", 40.0))
+            for target_time, details in schedule.items()
+            if isinstance(target_time, datetime) and target_time.tzinfo is None and isinstance(details, dict)
+            and isinstance(details.get("shower_temp", 40.0), (int, float))
+        ]
+        heating_plan = dict(zip(
+            [target_time for target_time, _ in batch_targets],
+            self.calc_start_heating_times(forecast_df=df_forecast, boiler_key=key, targets=batch_targets)
+        ))
+
         for target_time, details in schedule.items():
             if not isinstance(target_time, datetime):
                 print(f"❌ שגיאה: מפתח בלו״ז אינו מסוג datetime: {target_time}")
@@ -451,27 +546,31 @@ class BoilerManager(Device):
                 forecast_temp = 0.0
 
                 # Try to find when to start heating
-                heating_time, temp_at_start = self.calc_start_heating_time(
-                    forecast_df=df_forecast,
-                    boiler_key=key,
-                    target_time=target_time,
-                    target_temp=shower_temp
-                )
+                if target_time in heating_plan:
+                    heating_time, temp_at_start = heating_plan[target_time]
+                else:
+                    heating_time, temp_at_start = self.calc_start_heating_time(
+                        forecast_df=df_forecast,
+                        boiler_key=key,
+                        target_time=target_time,
+                        target_temp=shower_temp
+                    )
                 if heating_time:
                     print(
                         f"✅ Heating required! Email will be scheduled at {heating_time.strftime('%Y-%m-%d %H:%M:%S')}")
-                    auth_header = request.headers.get("Authorization")
-                    if not auth_header or not auth_header.startswith("Bearer "):
-                        return jsonify({"error": "Missing or invalid token"}), 401
+                    if user_email is None:
+                        auth_header = request.headers.get("Authorization")
+                        if not auth_header or not auth_header.startswith("Bearer "):
+                            return jsonify({"error": "Missing or invalid token"}), 401
+                        user_context = g.get("user")
+                        user_email = user_context["_id"] if user_context else None
 
-                    email_key = (heating_time.replace(second=0, microsecond=0), target_time)
+                    email_key = (user_email, heating_time.replace(second=0, microsecond=0), target_time)
 
                     if email_key in scheduled_email_times:
                         print(f"⚠️ Skipping duplicate schedule for: {email_key}")
                     else:
                         scheduled_email_times.add(email_key)
-                        user_context = g.get("user")
-                        user_email = user_context["_id"] if user_context else None
                         schedule_heating_email(
                             heating_start_time=heating_time,
                             target_time=target_time,
@@ -486,25 +585,18 @@ class BoilerManager(Device):
                     available_minutes = int((target_time - datetime.now()).total_seconds() // 60)
 
                     if available_minutes > 0:
-                        heating_profile = self.simulate_heating_profile(
-                            start_time=datetime.now(),
-                            start_temp=temp_now,
-                            max_duration_minutes=available_minutes,
-                            step_minutes=1
-                        )
+                        heating_curve = self.heating_curve(start_time=datetime.now(), start_temp=temp_now)
+                        max_temp_reached = heating_curve.temperature_after(available_minutes)
 
-
-                        if heating_profile:
-                            max_temp_reached = list(heating_profile.values())[-1]
-                            if max_temp_reached >= shower_temp:
-                                status = (
-                                    f"We will reach {shower_temp}°C by {target_time.strftime('%H:%M')}"
-                                )
-                            else:
-                                status = (
-                                    f"We will not reach {shower_temp}°C by {target_time.strftime('%H:%M')}, "
-                                    f"but we can reach about {max_temp_reached:.1f}°C"
-                                )
+                        if max_temp_reached >= shower_temp:
+                            status = (
+                                f"We will reach {shower_temp}°C by {target_time.strftime('%H:%M')}"
+                            )
+                        else:
+                            status = (
+                                f"We will not reach {shower_temp}°C by {target_time.strftime('%H:%M')}, "
+                                f"but we can reach about {max_temp_reached:.1f}°C"
+                            )
                     else:
                         status = "Insufficient - not enough time to heat"
 
@@ -609,48 +701,25 @@ class BoilerManager(Device):
             )
 
         # 6. update scale
-        scale_path = "scale_temperature_list.save"
-        if os.path.exists(scale_path):
-            scale = joblib.load(scale_path)
-        else:
-            scale = []
-
-        scale.append(round(scale_temperature, 2))
-        if len(scale) > 24:
-            scale.pop(0)
-
-        joblib.dump(scale, scale_path)
+        self.temperature_history.append(scale_temperature)
         print(f"📈 Updated scale with {scale_temperature:.2f}°C")
 
-    def simulate_heating_profile(self, start_time: datetime, start_temp: float, max_duration_minutes: int = 90,
-                                 step_minutes: int = 10):
-
+    def heating_curve(self, start_time: datetime, start_temp: float) -> HeatingCurve:
+        """
+        Closed-form heating curve of this boiler starting at start_time from start_temp.
+        """
         MAX_TEMP = 68.0
         c = 4.186  # kJ/kg°C
         mass_kg = self.capacity_liters
         power_kj_per_min = self.power_usage * 1000 / 60
         efficiency = 0.9
 
-        current_temp = start_temp
-        current_time = start_time
-        elapsed_minutes = 0
+        degrees_per_minute = power_kj_per_min * efficiency / (mass_kg * c)
+        return HeatingCurve(start_time, start_temp, degrees_per_minute, max_temp=MAX_TEMP)
 
-        heating_profile = {}
-
-        while elapsed_minutes <= max_duration_minutes and current_temp < MAX_TEMP:
-
-            Q = power_kj_per_min * step_minutes * efficiency
-            delta_T = Q / (mass_kg * c)
-            current_temp = min(current_temp + delta_T, MAX_TEMP)
-
-
-            heating_profile[current_time] = round(current_temp, 2)
-
-
-            elapsed_minutes += step_minutes
-            current_time += timedelta(minutes=step_minutes)
-
-        return heating_profile
+    def simulate_heating_profile(self, start_time: datetime, start_temp: float, max_duration_minutes: int = 90,
+                                 step_minutes: int = 10):
+        return self.heating_curve(start_time, start_temp).profile(max_duration_minutes, step_minutes)
 
     def generate_natural_heating_profile(self, start_temp: float, hours: int = 4, step_minutes: int = 60,
                                          delta_per_hour: float = 0.5):
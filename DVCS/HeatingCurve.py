@@ -0,0 +1,65 @@
+import math
+from datetime import datetime, timedelta
+
+
+class HeatingCurve:
+    """
+    Closed-form electric heating curve of a boiler: the temperature rises linearly at
+    `degrees_per_minute` from `start_temp` until it reaches `max_temp`.
+
+    Answers "temperature at time t" and "when is T reached" in O(1); a stepped profile is only
+    materialized when profile() is called.
+
+    Args:
+        start_time (datetime): when heating starts
+        start_temp (float): water temperature at start_time (°C)
+        degrees_per_minute (float): heating rate (°C/min)
+        max_temp (float): thermostat cut-off (°C)
+    """
+
+    def __init__(self, start_time: datetime, start_temp: float, degrees_per_minute: float, max_temp: float = 68.0):
+        self.start_time = start_time
+        self.start_temp = start_temp
+        self.degrees_per_minute = degrees_per_minute
+        self.max_temp = max_temp
+
+    def temperature_after(self, minutes: float) -> float:
+        if minutes <= 0:
+            return self.start_temp
+        return max(self.start_temp, min(self.start_temp + self.degrees_per_minute * minutes, self.max_temp))
+
+    def temperature_at(self, when: datetime) -> float:
+        return self.temperature_after((when - self.start_time).total_seconds() / 60)
+
+    def minutes_to_reach(self, target_temp: float):
+        """
+        Heating minutes needed to reach target_temp (0 if already there, None if above max_temp).
+        """
+        if target_temp <= self.start_temp:
+            return 0.0
+        if target_temp > self.max_temp or self.degrees_per_minute <= 0:
+            return None
+        return (target_temp - self.start_temp) / self.degrees_per_minute
+
+    def time_to_reach(self, target_temp: float):
+        minutes = self.minutes_to_reach(target_temp)
+        return None if minutes is None else self.start_time + timedelta(minutes=minutes)
+
+    def profile(self, max_duration_minutes: int = 90, step_minutes: int = 10) -> dict:
+        """
+        Stepped {time: temp} profile, same layout as the old simulate_heating_profile loop: each entry
+        holds the temperature after one more step of heating and the profile stops at max_temp.
+        """
+        if self.start_temp >= self.max_temp:
+            return {}
+
+        steps = int(max_duration_minutes // step_minutes) + 1
+        if self.degrees_per_minute > 0:
+            # Steps that still start below max_temp
+            steps = min(steps, math.ceil((self.max_temp - self.start_temp) / (self.degrees_per_minute * step_minutes)))
+
+        return {
+            self.start_time + timedelta(minutes=i * step_minutes):
+                round(self.temperature_after((i + 1) * step_minutes), 2)
+            for i in range(steps)
+        }
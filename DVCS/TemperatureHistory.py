@@ -0,0 +1,107 @@
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+
+from UTILS.snapshotWriter import atomic_write, snapshot_writer
+
+
+class TemperatureHistory:
+    """
+    Fixed-size ring buffer of boiler temperature samples with O(1) append.
+
+    Replaces the joblib list that used to be loaded, appended, popped and dumped on every sample.
+    The buffer lives in memory and is written to `path` by the background snapshot writer only
+    when it changed since the last snapshot.
+
+    Args:
+        capacity (int): number of samples kept (oldest are overwritten first)
+        path (str | None): snapshot file, also read on start-up; None keeps it in memory only
+    """
+
+    def __init__(self, capacity: int = 24, path: str = "scale_temperature_list.save"):
+        self.capacity = capacity
+        self.path = path
+        self._temps = np.zeros(capacity, dtype=np.float64)
+        self._times = np.full(capacity, np.nan, dtype=np.float64)  # epoch seconds
+        self._next = 0
+        self._count = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        if path is not None:
+            self._load()
+            snapshot_writer.register(self)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            data = joblib.load(self.path)
+        except Exception as e:
+            print(f"⚠ Could not read temperature history {self.path}: {e}")
+            return
+
+        if isinstance(data, dict):
+            temps, times = data.get("temps", []), data.get("times", [])
+        else:
+            # Legacy snapshot: a plain list of temperatures without timestamps
+            temps, times = list(data), [np.nan] * len(data)
+
+        for temp, when in zip(temps[-self.capacity:], times[-self.capacity:]):
+            self._append_locked(temp, when)
+        self._dirty = False
+
+    def _append_locked(self, temp, when):
+        self._temps[self._next] = temp
+        self._times[self._next] = when
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def append(self, temp: float, when: float = None):
+        with self._lock:
+            self._append_locked(round(float(temp), 2), time.time() if when is None else when)
+            self._dirty = True
+
+    def _ordered(self):
+        idx = (np.arange(self._count) + self._next - self._count) % self.capacity
+        return self._temps[idx], self._times[idx]
+
+    def values(self) -> list:
+        """
+        All samples, oldest first (same order as the old joblib list).
+        """
+        with self._lock:
+            return self._ordered()[0].tolist()
+
+    def last(self, n: int) -> list:
+        with self._lock:
+            return self._ordered()[0][-n:].tolist() if n > 0 else []
+
+    def last_hours(self, hours: float, now: float = None) -> list:
+        """
+        Samples recorded during the last `hours` hours, oldest first.
+        """
+        cutoff = (time.time() if now is None else now) - hours * 3600
+        with self._lock:
+            temps, times = self._ordered()
+            return temps[times >= cutoff].tolist()
+
+    def __len__(self):
+        return self._count
+
+    def flush(self):
+        """
+        Atomically write the buffer to its snapshot file if it changed.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            temps, times = self._ordered()
+            data = {"temps": temps.tolist(), "times": times.tolist()}
+            self._dirty = False
+        atomic_write(self.path, lambda tmp_path: joblib.dump(data, tmp_path))
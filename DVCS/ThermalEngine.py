@@ -0,0 +1,148 @@
+import numpy as np
+
+# Physical constants
+WATER_DENSITY = 1  # kg/L
+WATER_HEAT_CAPACITY = 4.18  # kJ/kg°C
+SOLAR_EFFICIENCY = 0.70
+COLLECTOR_AREA = 3.0  # m²
+INSULATION_K = 0.035
+INSULATION_THICKNESS = 0.05  # m
+MIN_EFFECTIVE_RADIATION = 100
+MAX_COOLING_PER_HOUR = 0.8
+
+# Efficiency by boiler size
+COLLECTOR_EFFICIENCY_PER_SIZE = {
+    50: 1.0,
+    100: 0.85,
+    150: 0.75
+}
+
+
+def _noise(rng, scale, shape):
+    # rng=None switches the measurement noise off (exact, reproducible trajectories)
+    return rng.normal(0, scale, shape) if rng is not None else 0.0
+
+
+def _collector_efficiency(volume_liters):
+    volume_liters = np.asarray(volume_liters)
+    size_eff = np.full(volume_liters.shape, 0.8)
+    for size, eff in COLLECTOR_EFFICIENCY_PER_SIZE.items():
+        size_eff = np.where(volume_liters == size, eff, size_eff)
+    return size_eff
+
+
+def solar_heating_step(prev_temp, radiation, cloud_cover, hour, month, volume_liters, rng):
+    """
+    Array version of BoilerManager.compute_solar_heating: one hour of solar gain for every element.
+    All arguments broadcast together; noise is drawn from `rng` (a np.random.Generator, None = no noise).
+    """
+    prev_temp, radiation, cloud_cover, hour, month, volume_liters = np.broadcast_arrays(
+        np.asarray(prev_temp, dtype=np.float64), radiation, cloud_cover, hour, month, volume_liters
+    )
+    active = (hour >= 6) & (hour <= 18) & (radiation > MIN_EFFECTIVE_RADIATION)
+
+    hour_weight = np.maximum(np.exp(-((hour - 13.5) ** 2) / 6.0), 0.25)
+    temp_loss_factor = np.clip(1 - ((prev_temp - 45) / 40), 0.3, 1.0)
+    with np.errstate(invalid="ignore"):
+        cloud_factor = np.power(1 - cloud_cover.astype(np.float64), 1.2)
+
+    effective_radiation = (
+            radiation * cloud_factor *
+            SOLAR_EFFICIENCY * hour_weight *
+            temp_loss_factor * _collector_efficiency(volume_liters) * 1.15
+    )
+
+    energy_kJ = (effective_radiation / 1000) * COLLECTOR_AREA * 3600
+    mass = volume_liters * WATER_DENSITY
+    delta_temp = energy_kJ / (mass * WATER_HEAT_CAPACITY)
+    temp = prev_temp + delta_temp + _noise(rng, 0.05, prev_temp.shape)
+
+    seasonal_cap = np.where((month >= 4) & (month <= 9), 68, 60)
+    return np.where(active, np.minimum(temp, seasonal_cap), prev_temp)
+
+
+def physical_cooling_step(prev_temp, ambient_temp, volume_liters, hour, wind_speed, rng):
+    """
+    Array version of BoilerManager.compute_physical_cooling: one hour of heat loss for every element.
+    """
+    prev_temp, ambient_temp, volume_liters, hour, wind_speed = np.broadcast_arrays(
+        np.asarray(prev_temp, dtype=np.float64), ambient_temp, volume_liters, hour, wind_speed
+    )
+    mass = volume_liters * WATER_DENSITY
+    delta_T = prev_temp - ambient_temp
+
+    surface_area = 1.1 + 0.01 * volume_liters
+    insulation_variation = 1.0 + _noise(rng, 0.02, prev_temp.shape)
+    U_value = (INSULATION_K / INSULATION_THICKNESS) * insulation_variation
+    Q_kJ = U_value * surface_area * delta_T * 3600 / 1000
+    delta_temp = Q_kJ / (mass * WATER_HEAT_CAPACITY)
+
+    hour_factor = np.select(
+        [(hour >= 21) | (hour <= 5), ((hour >= 6) & (hour <= 9)) | ((hour >= 18) & (hour <= 20))],
+        [1.3, 0.7],
+        default=0.3
+    )
+    hour_factor = np.where((hour >= 13) & (hour <= 16) & (ambient_temp > 27), hour_factor * 0.6, hour_factor)
+
+    wind_factor = 1 + 0.05 * wind_speed
+    insulation_factor = 1 - (volume_liters - 50) / 300
+
+    delta_temp = np.minimum(delta_temp * hour_factor * wind_factor * insulation_factor, MAX_COOLING_PER_HOUR)
+    cooled = prev_temp - delta_temp + _noise(rng, 0.05, prev_temp.shape)
+    return np.where(delta_T <= 0, prev_temp, cooled)
+
+
+class ThermalEngine:
+    """
+    Advances boiler water temperatures hour by hour for many (capacity, solar) configurations at once.
+
+    Args:
+        seed (int | np.random.Generator | None): seed or generator for the measurement noise
+        noise (bool): add the measurement noise; False gives the deterministic physics only
+    """
+
+    def __init__(self, seed=None, noise: bool = True):
+        self.rng = np.random.default_rng(seed) if noise else None
+
+    def simulate(self, start_temps, volumes, has_solar, radiation, cloud_cover, ambient_temp, wind_speed,
+                 hours, months, apply_cooling: bool = False, round_decimals: int = None) -> np.ndarray:
+        """
+        Run K configurations over H hours.
+
+        Args:
+            start_temps, volumes, has_solar: (K,) arrays (or scalars) describing each boiler
+            radiation, cloud_cover, ambient_temp, wind_speed: (H,) or (K, H) weather per hour
+            hours, months: (H,) local hour of day and month of each step
+            apply_cooling (bool): also apply physical cooling after the solar gain
+            round_decimals (int | None): round after every step, like the inject loop does
+
+        Returns:
+            np.ndarray: (K, H) temperature after each hour
+        """
+        start_temps, volumes, has_solar = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(start_temps, dtype=np.float64)), np.atleast_1d(volumes), np.atleast_1d(has_solar)
+        )
+        n_configs = start_temps.shape[0]
+        n_hours = np.shape(hours)[-1]
+
+        def per_config(values):
+            return np.broadcast_to(np.asarray(values, dtype=np.float64), (n_configs, n_hours))
+
+        radiation, cloud_cover = per_config(radiation), per_config(cloud_cover)
+        ambient_temp, wind_speed = per_config(ambient_temp), per_config(wind_speed)
+        hours, months = per_config(hours), per_config(months)
+        has_solar = has_solar.astype(bool)
+
+        temps = start_temps.copy()
+        trajectory = np.empty((n_configs, n_hours), dtype=np.float64)
+        for h in range(n_hours):
+            heated = solar_heating_step(
+                temps, radiation[:, h], cloud_cover[:, h], hours[:, h], months[:, h], volumes, self.rng
+            )
+            temps = np.where(has_solar, heated, temps)
+            if apply_cooling:
+                temps = physical_cooling_step(temps, ambient_temp[:, h], volumes, hours[:, h], wind_speed[:, h], self.rng)
+            if round_decimals is not None:
+                temps = np.round(temps, round_decimals)
+            trajectory[:, h] = temps
+        return trajectory
@@ -0,0 +1,113 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from UTILS.snapshotWriter import atomic_write, snapshot_writer
+
+
+class WeatherWindowStore:
+    """
+    In-memory copy of the rolling 6-hour model input window (weather features + previous boiler temps).
+
+    Real-time updates change one cell of a float32 matrix in place. The window is written to a
+    compact .npz file by the background snapshot writer (on its timer and at shutdown) instead of
+    re-serializing a CSV on every heat/cool event.
+
+    Args:
+        path (str): .npz snapshot file
+        legacy_csv (str): last_6_hours_weather.csv, imported once when no snapshot exists yet
+    """
+
+    def __init__(self, path: str = "last_6_hours_weather.npz", legacy_csv: str = "last_6_hours_weather.csv"):
+        self.path = path
+        self.legacy_csv = legacy_csv
+        self.dates = np.array([], dtype=object)
+        self.columns = []
+        self._column_index = {}
+        self.values = np.zeros((0, 0), dtype=np.float32)
+        self._dirty = False
+        self._lock = threading.Lock()
+
+        self._load()
+        snapshot_writer.register(self)
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with np.load(self.path, allow_pickle=False) as data:
+                    self._set(data["dates"].astype(object), data["columns"].tolist(), data["values"])
+            elif os.path.exists(self.legacy_csv):
+                df = pd.read_csv(self.legacy_csv)
+                self._set(df["date"].astype(str).to_numpy(dtype=object), [c for c in df.columns if c != "date"],
+                          df.drop(columns="date").to_numpy(dtype=np.float32))
+                self._dirty = True  # migrate to the binary snapshot on the next flush
+        except Exception as e:
+            print(f"⚠ Could not load 6-hour weather window: {e}")
+
+    def _set(self, dates, columns, values):
+        self.dates = np.asarray(dates, dtype=object)
+        self.columns = list(columns)
+        self._column_index = {col: i for i, col in enumerate(self.columns)}
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+
+    def is_empty(self) -> bool:
+        return self.values.shape[0] == 0
+
+    def replace(self, dates: pd.Series, input_df: pd.DataFrame):
+        """
+        Start a new window from a forecast (dates + model input frame).
+        """
+        with self._lock:
+            self._set(dates.astype(str).to_numpy(dtype=object), input_df.columns,
+                      input_df.to_numpy(dtype=np.float32))
+            self._dirty = True
+
+    def set_latest(self, column: str, value: float) -> bool:
+        """
+        Set `column` of the newest row. Returns False if the window has no such column.
+        """
+        col = self._column_index.get(column)
+        if col is None or self.is_empty():
+            return False
+        with self._lock:
+            self.values[-1, col] = value
+            self._dirty = True
+        return True
+
+    def to_frame(self) -> pd.DataFrame:
+        with self._lock:
+            df = pd.DataFrame(self.values.copy(), columns=self.columns)
+            df.insert(0, "date", self.dates.copy())
+        return df
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            dates = self.dates.astype(str)
+            columns = np.array(self.columns, dtype=str)
+            values = self.values.copy()
+            self._dirty = False
+
+        def write(tmp_path):
+            with open(tmp_path, "wb") as f:
+                np.savez(f, dates=dates, columns=columns, values=values)
+
+        atomic_write(self.path, write)
+
+
+_shared_window = None
+_shared_window_lock = threading.Lock()
+
+
+def get_shared_weather_window() -> WeatherWindowStore:
+    """
+    The process-wide window (created on first use, in the current working directory).
+    """
+    global _shared_window
+    with _shared_window_lock:
+        if _shared_window is None:
+            _shared_window = WeatherWindowStore()
+        return _shared_window
@@ -0,0 +1,130 @@
+# === sharedModel.py ===
+# Process-wide holder for the boiler LSTM and its scalers, shared by every BoilerManager.
+# Complies with your naming rules: k_ for constants, l_ for local vars
+
+from tensorflow.keras.models import load_model
+import hashlib
+import joblib
+import os
+import threading
+import time
+
+# === Constants ===
+k_model_dir = os.environ.get("BOILER_MODEL_DIR", ".")
+k_model_file = "boiler_temperature_multitarget_lstm6h.h5"
+k_scaler_x_file = "scaler_x.save"
+k_scaler_y_file = "scaler_y.save"
+
+
+def _files_digest(*l_paths):
+    l_digest = hashlib.sha256()
+    for l_path in l_paths:
+        with open(l_path, "rb") as f:
+            for l_block in iter(lambda: f.read(1 << 20), b""):
+                l_digest.update(l_block)
+    return l_digest.hexdigest()[:16]
+
+
+def resident_memory_mb():
+    """
+    Current resident set size of this process in MB (None when /proc is not available).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            l_pages = int(f.read().split()[1])
+        return l_pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class SharedBoilerModel:
+    """
+    Loads the boiler LSTM and its scalers lazily, exactly once per process, and hands the same
+    objects to every caller.
+
+    The scalers and model version are plain Python/NumPy objects, so preload() can run in the
+    gunicorn master (--preload) and be shared copy-on-write by the forked workers. The Keras model
+    itself is built on first use inside each worker: the TensorFlow runtime is not fork-safe and a
+    model created before fork() deadlocks on its first predict in the child.
+    """
+
+    def __init__(self, l_model_dir=k_model_dir):
+        self.model_dir = l_model_dir
+        self._lock = threading.Lock()
+        self._model_pid = None
+        self.model = None
+        self.scaler_x = None
+        self.scaler_y = None
+        self.expected_features = None
+        self.version = None
+        self.load_seconds = {}
+
+    def _path(self, l_name):
+        return os.path.join(self.model_dir, l_name)
+
+    def _load_scalers_locked(self):
+        l_start = time.perf_counter()
+        self.scaler_x = joblib.load(self._path(k_scaler_x_file))
+        self.scaler_y = joblib.load(self._path(k_scaler_y_file))
+        self.expected_features = list(self.scaler_x.feature_names_in_)
+        self.version = _files_digest(
+            self._path(k_model_file), self._path(k_scaler_x_file), self._path(k_scaler_y_file)
+        )
+        self.load_seconds["scalers"] = time.perf_counter() - l_start
+
+    def preload(self):
+        """
+        Load the fork-safe part (scalers, feature list, version). Safe to call in the gunicorn master.
+        """
+        with self._lock:
+            if self.scaler_x is None:
+                self._load_scalers_locked()
+        return self
+
+    def get(self):
+        """
+        Return the holder with model and scalers loaded in the current process.
+        """
+        if self.model is not None and self._model_pid == os.getpid():
+            return self
+
+        with self._lock:
+            if self.scaler_x is None:
+                self._load_scalers_locked()
+            if self.model is None or self._model_pid != os.getpid():
+                l_start = time.perf_counter()
+                self.model = load_model(self._path(k_model_file), compile=False)
+                self._model_pid = os.getpid()
+                self.load_seconds["model"] = time.perf_counter() - l_start
+                print(f"📦 Boiler LSTM loaded in {self.load_seconds['model']:.2f}s (pid {self._model_pid})")
+        return self
+
+    def reload(self):
+        """
+        Drop everything and load the model files again (e.g. after retraining).
+        """
+        with self._lock:
+            self.model = None
+            self._model_pid = None
+            self.scaler_x = None
+            self.scaler_y = None
+            self.expected_features = None
+            self.version = None
+            self.load_seconds = {}
+        return self.get()
+
+
+def startup_report(l_label="process"):
+    """
+    Print how long the shared model took to load and the resident memory of this process.
+    """
+    l_rss = resident_memory_mb()
+    l_rss_text = f"{l_rss:.0f} MB" if l_rss is not None else "n/a"
+    l_seconds = shared_boiler_model.load_seconds
+    print(
+        f"📊 [{l_label} pid {os.getpid()}] model {shared_boiler_model.version} | "
+        f"scalers {l_seconds.get('scalers', 0):.2f}s | LSTM {l_seconds.get('model', 0):.2f}s | RSS {l_rss_text}"
+    )
+
+
+shared_boiler_model = SharedBoilerModel()
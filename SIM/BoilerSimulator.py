@@ -87,3 +87,127 @@ class BoilerSimulator:
                 reward -= 1
 
         return reward
+
+
+class VectorBoilerSimulator:
+    """
+    K independent BoilerSimulator environments advanced together with array arithmetic.
+
+    Every per-boiler setting may be a scalar (shared) or a length-K array. Environments that finish
+    their forecast are reset automatically: step() returns their fresh start state and keeps the
+    terminal state in `final_states` (same layout as the returned states).
+
+    Args:
+        boiler_capacity_liters, heater_power_kw, has_solar, num_users, target_temp: scalar or (K,) settings
+        weather_forecast: (H,) outside temperature shared by all environments, or (K, H) one series each
+        num_envs (int | None): K; inferred from the array arguments when omitted
+        seed (int | None): seed of the start-temperature generator
+    """
+
+    def __init__(self, boiler_capacity_liters, heater_power_kw, has_solar, num_users, weather_forecast,
+                 target_temp=65, num_envs=None, seed=None):
+        settings = [boiler_capacity_liters, heater_power_kw, has_solar, num_users, target_temp]
+        if num_envs is None:
+            num_envs = max([np.size(s) for s in settings] + [np.shape(weather_forecast)[0]
+                                                               if np.ndim(weather_forecast) == 2 else 1])
+        self.num_envs = num_envs
+
+        def per_env(value, dtype):
+            return np.broadcast_to(np.asarray(value, dtype=dtype), (num_envs,)).copy()
+
+        self.boiler_capacity_liters = per_env(boiler_capacity_liters, np.float64)
+        self.heater_power_kw = per_env(heater_power_kw, np.float64)
+        self.has_solar = per_env(has_solar, bool)
+        self.num_users = per_env(num_users, np.float64)
+        self.target_temp = per_env(target_temp, np.float64)
+
+        weather = np.asarray(weather_forecast, dtype=np.float64)
+        self.weather_forecast = np.broadcast_to(weather, (num_envs, weather.shape[-1]))
+        self.horizon = self.weather_forecast.shape[1]
+
+        self.rng = np.random.default_rng(seed)
+        self._env_index = np.arange(num_envs)
+        self.hour = np.zeros(num_envs, dtype=np.int64)
+        self.boiler_temp = np.full(num_envs, 25.0)
+        self.final_states = np.zeros((num_envs, 7), dtype=np.float32)
+        self.reset()
+
+    def reset(self, target_temp=None, env_mask=None):
+        """
+        Reset all environments, or only those selected by the boolean `env_mask`.
+        """
+        if env_mask is None:
+            env_mask = np.ones(self.num_envs, dtype=bool)
+        if target_temp is not None:
+            self.target_temp[env_mask] = np.broadcast_to(target_temp, (self.num_envs,))[env_mask]
+        self.hour[env_mask] = 0
+        self.boiler_temp[env_mask] = 25 + self.rng.uniform(-2, 2, int(env_mask.sum()))
+        return self._get_states()
+
+    def step(self, actions):
+        """
+        Advance every environment by one hour.
+
+        Args:
+            actions (np.ndarray): (K,) action per environment (1 = heater on)
+
+        Returns:
+            tuple: states (K, 7), rewards (K,), dones (K,) — done environments are already reset
+        """
+        actions = np.asarray(actions)
+        hour_of_day = self.hour % 24
+        outside_temp = self.weather_forecast[self._env_index, self.hour]
+        temps = self.boiler_temp
+
+        # Simulate solar effect
+        solar = self.has_solar & (hour_of_day >= 8) & (hour_of_day <= 17)
+        temps = np.where(solar, temps + 0.05 * (outside_temp - temps), temps)
+
+        # Simulate heater
+        temps = np.where(actions == 1, temps + self.heater_power_kw * 0.5, temps)
+
+        # Cooling
+        temps = temps + 0.02 * (outside_temp - temps)
+
+        # Simulate hot water usage
+        usage = ((hour_of_day >= 6) & (hour_of_day <= 8)) | ((hour_of_day >= 18) & (hour_of_day <= 21))
+        temps = np.where(usage, temps - 0.3 * self.num_users, temps)
+
+        self.boiler_temp = np.clip(temps, 0, 100)
+
+        rewards = self._calculate_rewards(actions, hour_of_day)
+
+        self.hour += 1
+        dones = self.hour >= self.horizon
+
+        states = self._get_states()
+        if dones.any():
+            self.final_states[dones] = states[dones]
+            states = self.reset(env_mask=dones)
+
+        return states, rewards, dones
+
+    def _get_states(self):
+        return np.column_stack([
+            self.boiler_temp,
+            self.weather_forecast[self._env_index, self.hour % self.horizon],
+            self.hour % 24,
+            self.has_solar,
+            self.num_users,
+            self.boiler_capacity_liters,
+            self.target_temp
+        ]).astype(np.float32)
+
+    def _calculate_rewards(self, actions, hour_of_day):
+        temp_diff = self.boiler_temp - self.target_temp
+
+        rewards = np.select(
+            [temp_diff < 0, temp_diff <= 3, temp_diff > 10],
+            [-np.abs(temp_diff) * 0.3, 2.0, -3.0],
+            default=-0.5
+        )
+        rewards = rewards - 0.5 * (actions == 1)
+
+        evening = (hour_of_day >= 18) & (hour_of_day <= 21)
+        rewards = rewards + np.where(evening, np.where(self.boiler_temp >= self.target_temp, 3, -1), 0)
+        return rewards
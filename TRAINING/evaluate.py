@@ -1,12 +1,12 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from tensorflow.keras.models import load_model
 from SIM.BoilerSimulator import BoilerSimulator
+from AGENTS.numpy_policy import load_policy
 
-# --- Load trained model ---
+# --- Load trained model (as a NumPy policy, exported next to the .h5 on first use) ---
 model_path = 'dql_boiler_model.h5'
-model = load_model(model_path, compile=False)
+policy = load_policy(model_path)
 
 # --- Create environment for evaluation ---
 # You can change the settings here to simulate different boilers
@@ -34,8 +34,7 @@ rewards = []
 
 # --- Evaluate loop ---
 for t in range(episode_length):
-    q_values = model.predict(state[np.newaxis, :], verbose=0)[0]
-    action = np.argmax(q_values)  # Choose best action
+    action = policy.act(state)  # Choose best action
     next_state, reward, done = env.step(action)
 
     # Track stats
@@ -0,0 +1,257 @@
+import multiprocessing as mp
+import os
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from SIM.BoilerSimulator import BoilerSimulator
+from AGENTS.numpy_policy import NumpyPolicy
+
+ROLLOUT_WORKERS_ENV = "DQL_ROLLOUT_WORKERS"
+
+
+def rollout_workers_from_env() -> int:
+    """
+    Number of rollout worker processes requested through DQL_ROLLOUT_WORKERS (0 = serial training).
+    """
+    try:
+        return max(0, int(os.environ.get(ROLLOUT_WORKERS_ENV, "0")))
+    except ValueError:
+        print(f"⚠ Ignoring invalid {ROLLOUT_WORKERS_ENV}={os.environ[ROLLOUT_WORKERS_ENV]!r}")
+        return 0
+
+
+class PolicySnapshot:
+    """
+    Policy weights shared with the rollout workers through one shared-memory block.
+
+    The learner publishes a new snapshot with publish(); workers copy it out only when the version
+    counter changed since their last sync.
+
+    Args:
+        shapes (list[tuple]): shapes of the Keras weight arrays (model.get_weights())
+    """
+
+    def __init__(self, shapes):
+        self.shapes = [tuple(s) for s in shapes]
+        self.sizes = [int(np.prod(s)) for s in self.shapes]
+        self.shm = shared_memory.SharedMemory(create=True, size=sum(self.sizes) * 4)
+        self.version = mp.Value("q", 0)
+        self.epsilon = mp.Value("d", 1.0, lock=False)
+
+    def _flat(self):
+        return np.ndarray((sum(self.sizes),), dtype=np.float32, buffer=self.shm.buf)
+
+    def publish(self, weights, epsilon: float):
+        flat = self._flat()
+        with self.version.get_lock():
+            flat[:] = np.concatenate([np.ravel(w) for w in weights])
+            self.epsilon.value = epsilon
+            self.version.value += 1
+
+    def read(self):
+        """
+        Copy the current weights out of shared memory (workers inherit the mapping when forked).
+
+        Returns:
+            tuple: (version, weights, epsilon)
+        """
+        with self.version.get_lock():
+            flat = self._flat().copy()
+            version, epsilon = self.version.value, self.epsilon.value
+        weights, offset = [], 0
+        for shape, size in zip(self.shapes, self.sizes):
+            weights.append(flat[offset:offset + size].reshape(shape))
+            offset += size
+        return version, weights, epsilon
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+class TransitionRing:
+    """
+    Ring of episode slots in one shared-memory block.
+
+    A worker takes a free slot index, writes its episode into the slot in place and passes only the index
+    back through the `filled` queue; the learner copies the slot out and returns the index to `free`.
+    No transition arrays are pickled, and the number of slots bounds how far workers can run ahead.
+
+    Args:
+        ctx: multiprocessing context the queues are created in
+        num_slots (int): episodes that can be in flight at once
+        episode_length (int): transitions per episode
+        state_size (int): length of a state vector
+    """
+
+    def __init__(self, ctx, num_slots: int, episode_length: int, state_size: int):
+        self.num_slots = num_slots
+        self.fields = [
+            ("states", (episode_length, state_size), np.float32),
+            ("actions", (episode_length,), np.int64),
+            ("rewards", (episode_length,), np.float32),
+            ("next_states", (episode_length, state_size), np.float32),
+            ("dones", (episode_length,), np.float32),
+        ]
+        self.offsets, size = [], 0
+        for _, shape, dtype in self.fields:
+            self.offsets.append(size)
+            size += num_slots * int(np.prod(shape)) * np.dtype(dtype).itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+
+        self.free = ctx.Queue()
+        self.filled = ctx.Queue()
+        for slot in range(num_slots):
+            self.free.put(slot)
+
+    def _views(self):
+        # Built per call so no buffer export outlives close()
+        return [
+            np.ndarray((self.num_slots,) + shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            for (_, shape, dtype), offset in zip(self.fields, self.offsets)
+        ]
+
+    def write(self, slot: int, episode):
+        for view, values in zip(self._views(), episode):
+            view[slot] = values
+
+    def read(self, slot: int):
+        """
+        Copy one slot out of shared memory.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones)
+        """
+        return tuple(view[slot].copy() for view in self._views())
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _rollout_worker(worker_id, snapshot, ring, stop_event, env_settings, episode_length, seed):
+    rng = np.random.default_rng(seed + worker_id)
+    np.random.seed(seed + worker_id)  # BoilerSimulator.reset draws from the global generator
+
+    # Every worker simulates its own weather week
+    weather_forecast = pd.Series(rng.uniform(10, 30, size=24 * 7))
+    env = BoilerSimulator(weather_forecast=weather_forecast, **env_settings)
+    version, policy, epsilon = -1, None, 1.0
+
+    while not stop_event.is_set():
+        if snapshot.version.value != version:
+            version, weights, epsilon = snapshot.read()
+            policy = NumpyPolicy(weights)
+
+        # Wait for a free slot, then write the episode straight into it
+        slot = None
+        while slot is None and not stop_event.is_set():
+            try:
+                slot = ring.free.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        if slot is None:
+            break
+
+        state = env.reset(target_temp=rng.integers(60, 70))
+        states = np.zeros((episode_length, state.shape[0]), dtype=np.float32)
+        next_states = np.zeros_like(states)
+        actions = np.zeros(episode_length, dtype=np.int64)
+        rewards = np.zeros(episode_length, dtype=np.float32)
+        dones = np.zeros(episode_length, dtype=np.float32)
+
+        for t in range(episode_length):
+            action = policy.act(state, epsilon, rng)
+            next_state, reward, done = env.step(action)
+            states[t], actions[t], rewards[t], next_states[t], dones[t] = state, action, reward, next_state, done
+            state = next_state
+
+        ring.write(slot, (states, actions, rewards, next_states, dones))
+        ring.filled.put(slot)
+
+
+class RolloutPool:
+    """
+    Worker processes that act with a synced snapshot of the agent's policy and hand finished episodes
+    back to the learner through a shared-memory TransitionRing.
+
+    Workers never touch TensorFlow: they act with a NumpyPolicy built from the snapshot, so they can be forked
+    from a learner that already built its Keras models.
+
+    Args:
+        agent (DQLAgent): learner whose model weights and epsilon are published
+        num_workers (int): number of worker processes
+        env_settings (dict): BoilerSimulator keyword arguments except weather_forecast
+        episode_length (int): hours per episode
+        seed (int): base seed; worker i uses seed + i
+        queue_size (int | None): ring slots, i.e. episodes buffered before workers wait (default 4 per worker)
+    """
+
+    def __init__(self, agent, num_workers: int, env_settings: dict, episode_length: int = 24,
+                 seed: int = 0, queue_size: int = None):
+        ctx = mp.get_context("fork")
+        self.snapshot = PolicySnapshot([w.shape for w in agent.model.get_weights()])
+        self.publish(agent)
+        state_size = self.snapshot.shapes[0][0]
+        self.ring = TransitionRing(ctx, queue_size or 4 * num_workers, episode_length, state_size)
+        self.stop_event = ctx.Event()
+        self.workers = [
+            ctx.Process(
+                target=_rollout_worker,
+                args=(i, self.snapshot, self.ring, self.stop_event,
+                      env_settings, episode_length, seed),
+                daemon=True
+            )
+            for i in range(num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        print(f"🧵 Started {num_workers} rollout workers")
+
+    def publish(self, agent):
+        self.snapshot.publish(agent.model.get_weights(), agent.epsilon)
+
+    def drain(self, max_episodes: int = None, timeout: float = 60):
+        """
+        Block until at least one episode is ready, then take every other finished episode without waiting.
+
+        Args:
+            max_episodes (int | None): upper bound on episodes returned
+            timeout (float): seconds to wait for the first episode
+
+        Returns:
+            list[tuple]: (states, actions, rewards, next_states, dones) arrays per episode
+        """
+        slots = [self.ring.filled.get(timeout=timeout)]
+        while max_episodes is None or len(slots) < max_episodes:
+            try:
+                slots.append(self.ring.filled.get_nowait())
+            except queue.Empty:
+                break
+
+        episodes = []
+        for slot in slots:
+            episodes.append(self.ring.read(slot))
+            self.ring.free.put(slot)
+        return episodes
+
+    def next_episode(self, timeout: float = 60):
+        """
+        Block until a worker delivers an episode.
+
+        Returns:
+            tuple: (states, actions, rewards, next_states, dones) arrays of one episode
+        """
+        return self.drain(1, timeout)[0]
+
+    def close(self):
+        self.stop_event.set()
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self.snapshot.close()
+        self.ring.close()
@@ -0,0 +1,152 @@
+import itertools
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from SIM.BoilerSimulator import VectorBoilerSimulator
+from AGENTS.numpy_policy import NumpyPolicy, load_policy
+
+HEATER_POWER_KW = {50: 2.0, 100: 3.0, 150: 4.0}
+EPISODE_LENGTH = 24 * 7
+# Grids up to this many scenarios run in-process; larger ones are split across a process pool
+PARALLEL_MIN_SCENARIOS = 1024
+CHUNK_SIZE = 512
+
+
+def build_scenario_grid(capacities=(50, 100, 150), solar=(False, True), users=(1, 2, 3), targets=(68,),
+                        weather_seeds=(0,)) -> pd.DataFrame:
+    """
+    Cartesian product of the scenario settings, one row per scenario.
+
+    A weather seed of None draws a fresh random weather week for that scenario.
+    """
+    rows = [
+        {
+            "capacity": capacity,
+            "has_solar": has_solar,
+            "num_users": num_users,
+            "target_temp": target_temp,
+            "weather_seed": seed
+        }
+        for capacity, has_solar, num_users, target_temp, seed in
+        itertools.product(capacities, solar, users, targets, weather_seeds)
+    ]
+    return pd.DataFrame(rows)
+
+
+def _weather_weeks(seeds, episode_length):
+    return np.stack([
+        np.random.default_rng(None if pd.isna(seed) else int(seed)).uniform(5, 35, size=episode_length)
+        for seed in seeds
+    ])
+
+
+def run_sweep(q_function, scenarios: pd.DataFrame, episode_length: int = EPISODE_LENGTH) -> pd.DataFrame:
+    """
+    Evaluate a greedy policy on every scenario, stepping all of them in lockstep.
+
+    Args:
+        q_function (callable): maps stacked states (K, state_size) to Q-values (K, actions), e.g. a NumpyPolicy
+        scenarios (pd.DataFrame): rows from build_scenario_grid()
+        episode_length (int): hours simulated per scenario
+
+    Returns:
+        pd.DataFrame: one row of metrics per scenario, in the order of `scenarios`
+    """
+    capacities = scenarios["capacity"].to_numpy()
+    targets = scenarios["target_temp"].to_numpy(dtype=np.float64)
+    env = VectorBoilerSimulator(
+        boiler_capacity_liters=capacities,
+        heater_power_kw=[HEATER_POWER_KW.get(c, 3.0) for c in capacities],
+        has_solar=scenarios["has_solar"].to_numpy(dtype=bool),
+        num_users=scenarios["num_users"].to_numpy(),
+        weather_forecast=_weather_weeks(scenarios["weather_seed"], episode_length),
+        target_temp=targets
+    )
+
+    num_envs = len(scenarios)
+    total_reward = np.zeros(num_envs)
+    successful_hot_water_hours = np.zeros(num_envs, dtype=np.int64)
+    total_target_hours = 0
+    total_heating_actions = np.zeros(num_envs, dtype=np.int64)
+
+    states = env.reset()
+    for t in range(episode_length):
+        actions = np.argmax(q_function(states), axis=1)
+        states, rewards, _ = env.step(actions)
+        total_reward += rewards
+
+        # Same check as the old per-scenario loop: env.hour after the step, without % 24
+        if 18 <= t + 1 <= 21:
+            total_target_hours += 1
+            successful_hot_water_hours += env.boiler_temp >= targets
+
+        total_heating_actions += actions == 1
+
+    success_rate = successful_hot_water_hours / total_target_hours * 100 if total_target_hours > 0 \
+        else np.zeros(num_envs)
+
+    return pd.DataFrame({
+        "Boiler Capacity (L)": capacities,
+        "Has Solar": scenarios["has_solar"].to_numpy(),
+        "Number of Users": scenarios["num_users"].to_numpy(),
+        "Target Temp": scenarios["target_temp"].to_numpy(),
+        "Weather Seed": scenarios["weather_seed"].to_numpy(),
+        "Total Reward": total_reward,
+        "Success Rate (%)": success_rate,
+        "Total Heating Actions": total_heating_actions
+    })
+
+
+_worker_policy = None
+
+
+def _init_sweep_worker(npz_path):
+    # Each worker loads the exported policy once
+    global _worker_policy
+    _worker_policy = NumpyPolicy.from_npz(npz_path)
+
+
+def _run_chunk(args):
+    scenarios, episode_length = args
+    return run_sweep(_worker_policy, scenarios, episode_length)
+
+
+def run_sweep_parallel(model_path: str, scenarios: pd.DataFrame, episode_length: int = EPISODE_LENGTH,
+                       workers: int = None, chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+    """
+    Split a large grid into chunks and sweep them on a process pool.
+
+    Args:
+        model_path (str): Keras model file; its exported .npz policy is loaded once by every worker
+        workers (int | None): pool size (default: CPU count)
+        chunk_size (int): scenarios stepped in lockstep per task
+    """
+    npz_path = os.path.splitext(model_path)[0] + ".npz"
+    load_policy(model_path, npz_path)  # export before forking
+    chunks = [(scenarios.iloc[i:i + chunk_size], episode_length) for i in range(0, len(scenarios), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=mp.get_context("fork"),
+                             initializer=_init_sweep_worker, initargs=(npz_path,)) as pool:
+        return pd.concat(pool.map(_run_chunk, chunks), ignore_index=True)
+
+
+def sweep(model_path: str, scenarios: pd.DataFrame, episode_length: int = EPISODE_LENGTH,
+          workers: int = None) -> pd.DataFrame:
+    """
+    Evaluate the model on a scenario grid, in-process for small grids and on a process pool for large ones.
+    """
+    if len(scenarios) > PARALLEL_MIN_SCENARIOS and (workers or os.cpu_count()) > 1:
+        return run_sweep_parallel(model_path, scenarios, episode_length, workers)
+
+    return run_sweep(load_policy(model_path), scenarios, episode_length)
+
+
+def save_results(results: pd.DataFrame, path: str = "scenario_sweep_results.parquet"):
+    """
+    Write sweep results as Parquet (columnar, keeps dtypes).
+    """
+    results.to_parquet(path, index=False)
+    print(f"✅ Sweep results saved to {path}")
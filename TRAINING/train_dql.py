@@ -6,7 +6,8 @@ from tensorflow.keras.models import load_model
 from tensorflow.keras.optimizers import Adam
 from SIM.BoilerSimulator import BoilerSimulator
 from AGENTS.dql_agent import DQLAgent
-from tqdm import trange
+from TRAINING.parallel_rollout import RolloutPool, rollout_workers_from_env
+from tqdm import tqdm, trange
 import pandas as pd
 
 # --- Load forecasted outside temperature (optional) ---
@@ -28,7 +29,9 @@ env = BoilerSimulator(
 
 state_size = env._get_state().shape[0]
 action_size = 2
-agent = DQLAgent(state_size=state_size, action_size=action_size)
+prioritized_replay = False  # sum-tree prioritized sampling instead of uniform replay
+agent = DQLAgent(state_size=state_size, action_size=action_size, memory_size=5000,
+                 prioritized_replay=prioritized_replay)
 
 model_path = 'dql_boiler_model.h5'
 training_state_path = 'training_state.json'
@@ -66,21 +69,30 @@ episode_length = 24  # 🔽 רק יום אחד
 batch_size = 32
 rewards_per_episode = []
 
-# --- Training loop ---
-for e in trange(start_episode, n_episodes, desc="Training episodes"):
-    random_target_temp = np.random.randint(60, 70)
-    state = env.reset(target_temp=random_target_temp)
-    total_episode_reward = 0
+# --- Parallel rollout (DQL_ROLLOUT_WORKERS=N): N processes act, this process only learns ---
+rollout_workers = rollout_workers_from_env()
+rollout = None
+if rollout_workers > 0:
+    rollout = RolloutPool(
+        agent,
+        num_workers=rollout_workers,
+        env_settings=dict(boiler_capacity_liters=boiler_capacity, heater_power_kw=heater_power_kw,
+                          has_solar=has_solar, num_users=num_users),
+        episode_length=episode_length
+    )
+
+# Serial training replays at t = 0, 20, ... of every episode; the rollout learner keeps that ratio
+replays_per_step = len(range(0, episode_length, 20)) / episode_length
 
-    for time in range(episode_length):
-        action = agent.act(state)
-        next_state, reward, done = env.step(action)
-        agent.remember(state, action, reward, next_state, done)
-        state = next_state
-        total_episode_reward += reward
 
-        if time % 20 == 0:  # 🔽 Replay פחות תדיר
-            agent.replay(batch_size)
+def finish_episode(e, total_episode_reward):
+    """
+    Per-episode bookkeeping shared by both loops: target sync, checkpoints, best reward, early stopping.
+
+    Returns:
+        bool: True when training should stop
+    """
+    global best_reward, no_improvement_counter
 
     if e % 5 == 0:
         agent.update_target_model()
@@ -104,10 +116,59 @@ for e in trange(start_episode, n_episodes, desc="Training episodes"):
 
     if no_improvement_counter >= patience:
         print(f"⏹ Early stopping triggered after {patience} episodes without improvement!")
-        break
+        return True
 
     if (e + 1) % 5 == 0:
         print(f"Episode {e+1}/{n_episodes} - Total Reward: {total_episode_reward:.2f} - Epsilon: {agent.epsilon:.2f}")
+    return False
+
+
+# --- Training loop ---
+if rollout is not None:
+    # Take every episode the workers finished since the last step, so they never wait on the learner
+    e = start_episode
+    with tqdm(total=n_episodes - start_episode, desc="Training episodes") as progress:
+        while e < n_episodes:
+            episodes = rollout.drain(max_episodes=n_episodes - e)
+            n_transitions = 0
+            for states, actions, rewards, next_states, dones in episodes:
+                agent.memory.add_batch(states, actions, rewards, next_states, dones)
+                n_transitions += len(actions)
+
+            for _ in range(int(np.ceil(n_transitions * replays_per_step))):
+                agent.replay(batch_size)
+            rollout.publish(agent)
+
+            stop = False
+            for episode in episodes:
+                stop = finish_episode(e, float(episode[2].sum()))
+                e += 1
+                progress.update(1)
+                if stop:
+                    break
+            if stop:
+                break
+else:
+    for e in trange(start_episode, n_episodes, desc="Training episodes"):
+        random_target_temp = np.random.randint(60, 70)
+        state = env.reset(target_temp=random_target_temp)
+        total_episode_reward = 0
+
+        for time in range(episode_length):
+            action = agent.act(state)
+            next_state, reward, done = env.step(action)
+            agent.remember(state, action, reward, next_state, done)
+            state = next_state
+            total_episode_reward += reward
+
+            if time % 20 == 0:  # 🔽 Replay פחות תדיר
+                agent.replay(batch_size)
+
+        if finish_episode(e, total_episode_reward):
+            break
+
+if rollout is not None:
+    rollout.close()
 
 # ✅ תיקון: שימוש בחישוב מפורש כי e כבר לא מוגדר מחוץ ללולאה
 final_episode = start_episode + len(rewards_per_episode)
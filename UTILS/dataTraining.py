@@ -7,13 +7,14 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Input
 from tensorflow.keras.callbacks import EarlyStopping
 import joblib  # For saving scalers
+from UTILS.sequenceBuilder import create_sequences
+from UTILS.featureCache import load_or_build
 
 start_time = time.time()
 
-# === 1. Load CSV ===
-df = pd.read_csv("Updated_With_Boiler_Hourly_Realistic_v4.csv", parse_dates=["date"])
+# === 1. Source CSV and targets ===
+CSV_PATH = "Updated_With_Boiler_Hourly_Realistic_v4.csv"
 
-# === 2. Define targets ===
 target_columns = [
     "boiler temp for 50 L with solar system",
     "boiler temp for 50 L without solar system",
@@ -23,19 +24,7 @@ target_columns = [
     "boiler temp for 150 L without solar system"
 ]
 
-# === 3. Add seasonal + hourly features ===
-df["month"] = df["date"].dt.month
-df["dayofyear"] = df["date"].dt.dayofyear
-df["hour"] = df["date"].dt.hour
-
-df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
-df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
-df["day_sin"] = np.sin(2 * np.pi * df["dayofyear"] / 365)
-df["day_cos"] = np.cos(2 * np.pi * df["dayofyear"] / 365)
-df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
-df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
-
-# === 4. Define base features ===
+# === 2. Define base features ===
 base_features = [
     "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature",
     "precipitation", "cloud_cover", "wind_speed_10m", "is_day",
@@ -43,17 +32,46 @@ base_features = [
     "month_sin", "month_cos", "day_sin", "day_cos",
     "hour_sin", "hour_cos"
 ]
+top_k = 10
 
-# === 5. Drop NaNs ===
-df = df.dropna(subset=base_features + target_columns).reset_index(drop=True)
 
-# === 6. Limit weather_description to top 10 ===
-top_k = 10
-top_weather = df["weather_description"].value_counts().nlargest(top_k).index
-df["weather_description"] = df["weather_description"].where(df["weather_description"].isin(top_weather), "Other")
+def build_features():
+    # === 3. Load CSV ===
+    df = pd.read_csv(CSV_PATH, parse_dates=["date"])
+
+    # === 4. Add seasonal + hourly features ===
+    df["month"] = df["date"].dt.month
+    df["dayofyear"] = df["date"].dt.dayofyear
+    df["hour"] = df["date"].dt.hour
+
+    df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
+    df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
+    df["day_sin"] = np.sin(2 * np.pi * df["dayofyear"] / 365)
+    df["day_cos"] = np.cos(2 * np.pi * df["dayofyear"] / 365)
+    df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
+    df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
 
-# === 7. One-hot encode weather_description only ===
-df = pd.get_dummies(df, columns=["weather_description"])
+    # === 5. Drop NaNs ===
+    df = df.dropna(subset=base_features + target_columns).reset_index(drop=True)
+
+    # === 6. Limit weather_description to top 10 ===
+    top_weather = df["weather_description"].value_counts().nlargest(top_k).index
+    df["weather_description"] = df["weather_description"].where(df["weather_description"].isin(top_weather), "Other")
+
+    # === 7. One-hot encode weather_description only ===
+    return pd.get_dummies(df, columns=["weather_description"])
+
+
+# Steps 3-7 are cached as Parquet, keyed by the CSV contents, this config and the source of build_features
+# (bump "version" when a change outside build_features alters the features). The whole frame is read back:
+# step 9 turns every column besides the targets and "date" into a model feature.
+FEATURE_CONFIG = {
+    "version": 1,
+    "base_features": base_features,
+    "target_columns": target_columns,
+    "top_k": top_k,
+}
+df = load_or_build(CSV_PATH, FEATURE_CONFIG, build_features)
 
 from sklearn.model_selection import train_test_split
 
@@ -114,6 +132,10 @@ val_df_scaled[target_columns] = y_val_raw
 test_df_scaled = pd.DataFrame(X_test_raw, columns=features)
 test_df_scaled[target_columns] = y_test_actual
 
+# Keep timestamps so sequences never cross the gaps between sampled days
+for df_part, df_scaled in [(train_df, train_df_scaled), (val_df, val_df_scaled), (test_df, test_df_scaled)]:
+    df_scaled["date"] = df_part["date"].to_numpy()
+
 # === ✅ 13. DEBUG: check alignment ===
 for df_name, df_part in [("train", train_df_scaled), ("val", val_df_scaled), ("test", test_df_scaled)]:
     df_cols = df_part.columns.tolist()
@@ -121,21 +143,11 @@ for df_name, df_part in [("train", train_df_scaled), ("val", val_df_scaled), ("t
         if col not in df_cols:
             raise ValueError(f"❌ {col} missing in {df_name}_df_scaled")
 
-# === 14. Robust Sequence Creation ===
-def create_sequences(df, feature_cols, target_cols, seq_len=6):
-    X_seq, y_seq = [], []
-    feature_data = df[feature_cols].values
-    target_data = df[target_cols].values
-    for i in range(seq_len, len(df)):
-        X_seq.append(feature_data[i-seq_len:i])
-        y_seq.append(target_data[i])
-    return np.array(X_seq), np.array(y_seq)
-
-# === 15. Generate Sequences ===
+# === 14-15. Generate Sequences (strided windows within contiguous hours) ===
 SEQUENCE_LENGTH = 6
-X_train, y_train = create_sequences(train_df_scaled, features, target_columns, SEQUENCE_LENGTH)
-X_val, y_val = create_sequences(val_df_scaled, features, target_columns, SEQUENCE_LENGTH)
-X_test, y_test_actual_seq = create_sequences(test_df_scaled, features, target_columns, SEQUENCE_LENGTH)
+X_train, y_train, _ = create_sequences(train_df_scaled, features, target_columns, SEQUENCE_LENGTH)
+X_val, y_val, _ = create_sequences(val_df_scaled, features, target_columns, SEQUENCE_LENGTH)
+X_test, y_test_actual_seq, test_target_idx = create_sequences(test_df_scaled, features, target_columns, SEQUENCE_LENGTH)
 
 # === 16. Build and train Bidirectional LSTM model ===
 from tensorflow.keras.models import Sequential
@@ -177,7 +189,7 @@ y_pred = scaler_y.inverse_transform(y_pred_scaled)
 
 # === 19. Save predictions ===
 df_result = pd.DataFrame({
-    "time": test_df["date"].iloc[SEQUENCE_LENGTH:SEQUENCE_LENGTH+len(y_pred)].values
+    "time": test_df["date"].iloc[test_target_idx].values
 })
 for i, target in enumerate(target_columns):
     df_result[f"{target} - Actual"] = y_test_actual_seq[:, i]
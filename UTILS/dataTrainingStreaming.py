@@ -0,0 +1,72 @@
+import time
+import joblib
+import numpy as np
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import LSTM, Dense, Input, Dropout, Bidirectional
+from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
+from tensorflow.keras.losses import Huber
+from UTILS.streamingDataset import StreamingPreprocessor, TARGET_COLUMNS
+
+# Same model as dataTraining.py, trained from a streamed CSV so multi-year / multi-site history
+# never has to fit in memory at once.
+
+start_time = time.time()
+
+CSV_PATH = "Updated_With_Boiler_Hourly_Realistic_v4.csv"
+SEQUENCE_LENGTH = 6
+BATCH_SIZE = 32
+
+# === 1. Streaming first pass: top-10 weather descriptions + scalers ===
+prep = StreamingPreprocessor(CSV_PATH, chunksize=100_000, top_k=10).fit()
+
+joblib.dump(prep.scaler_x, "scaler_x.save")
+joblib.dump(prep.scaler_y, "scaler_y.save")
+print("💾 Saved scaler_x.save and scaler_y.save")
+
+# === 2. Lazy window pipelines (days split by hash: ~70% train, 15% val, 15% test) ===
+train_ds = prep.dataset("train", SEQUENCE_LENGTH, BATCH_SIZE)
+val_ds = prep.dataset("val", SEQUENCE_LENGTH, BATCH_SIZE, shuffle_buffer=0)
+test_ds = prep.dataset("test", SEQUENCE_LENGTH, BATCH_SIZE, shuffle_buffer=0)
+
+# === 3. Build and train Bidirectional LSTM model ===
+model = Sequential([
+    Input(shape=(SEQUENCE_LENGTH, len(prep.features))),
+    Bidirectional(LSTM(64, return_sequences=True)),
+    Dropout(0.2),
+    Bidirectional(LSTM(32)),
+    Dropout(0.2),
+    Dense(len(TARGET_COLUMNS))
+])
+
+model.compile(optimizer='adam', loss=Huber(delta=3.0))
+
+early_stop = EarlyStopping(monitor='val_loss', patience=6, restore_best_weights=True, verbose=1)
+reduce_lr = ReduceLROnPlateau(monitor='val_loss', factor=0.5, patience=3, min_lr=1e-5, verbose=1)
+
+history = model.fit(
+    train_ds,
+    epochs=50,
+    validation_data=val_ds,
+    callbacks=[early_stop, reduce_lr],
+    verbose=1
+)
+
+# === 4. Save model ===
+model.save("boiler_temperature_multitarget_lstm6h.h5")
+print("✅ Model saved as boiler_temperature_multitarget_lstm6h.h5")
+
+# === 5. Test error in °C, streamed batch by batch ===
+abs_error_sum = np.zeros(len(TARGET_COLUMNS))
+n_test = 0
+for X_batch, y_batch in test_ds:
+    y_pred = prep.scaler_y.inverse_transform(model.predict_on_batch(X_batch))
+    y_true = prep.scaler_y.inverse_transform(y_batch.numpy())
+    abs_error_sum += np.abs(y_pred - y_true).sum(axis=0)
+    n_test += len(y_true)
+
+if n_test:
+    for target, mae in zip(TARGET_COLUMNS, abs_error_sum / n_test):
+        print(f"📊 {target}: MAE {mae:.2f}°C")
+
+end_time = time.time()
+print(f"🕒 Total training time: {end_time - start_time:.2f} seconds")
@@ -0,0 +1,75 @@
+import hashlib
+import inspect
+import json
+import os
+
+import pandas as pd
+
+from UTILS.snapshotWriter import atomic_write
+
+FEATURE_CACHE_DIR = "feature_cache"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    """
+    sha256 of a file's contents, read in 1 MB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_digest(func) -> str:
+    """
+    sha256 of a function's source, so editing the build code invalidates artifacts it produced.
+    Helpers it calls are not covered: bump the config version when changing those.
+    """
+    try:
+        code = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        # No source file (e.g. defined in a REPL): fall back to the compiled bytecode and constants
+        code = func.__code__.co_code + repr(func.__code__.co_consts).encode()
+    return hashlib.sha256(code).hexdigest()
+
+
+def cache_key(source_path: str, config: dict) -> str:
+    """
+    Key of a preprocessed artifact: changes whenever the source file or the feature config changes.
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(f"{file_digest(source_path)}:{payload}".encode()).hexdigest()[:20]
+
+
+def cache_path(source_path: str, config: dict, cache_dir: str = FEATURE_CACHE_DIR) -> str:
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir, f"{name}-{cache_key(source_path, config)}.parquet")
+
+
+def load_or_build(source_path: str, config: dict, build_func,
+                  cache_dir: str = FEATURE_CACHE_DIR) -> pd.DataFrame:
+    """
+    Load the preprocessed frame for (source file, config) from the Parquet cache, or build and store it.
+
+    Args:
+        source_path (str): raw input file (hashed together with config and the source of build_func)
+        config (dict): everything that changes the preprocessing output (JSON-serializable)
+        build_func (callable): builds the preprocessed DataFrame on a cache miss
+        cache_dir (str): where the .parquet artifacts live
+
+    Returns:
+        pd.DataFrame: the preprocessed frame
+    """
+    config = {**config, "build_code": code_digest(build_func)}
+    path = cache_path(source_path, config, cache_dir)
+    if os.path.exists(path):
+        print(f"♻️ Loading cached features from {path}")
+        return pd.read_parquet(path)
+
+    print(f"🛠 Building features (cache miss) → {path}")
+    df = build_func()
+    os.makedirs(cache_dir, exist_ok=True)
+    atomic_write(path, lambda tmp_path: df.to_parquet(tmp_path, index=False))
+    return df
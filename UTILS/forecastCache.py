@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import UTILS.weatherAPIRequest as weather
+from UTILS.ttlCache import TTLCache
+
+# === Cache settings ===
+GRID_RESOLUTION_DEG = 0.1      # ~11 km, finer than the Open-Meteo model grids
+FORECAST_TTL_SECONDS = 3600    # Open-Meteo refreshes its forecasts hourly
+FORECAST_CACHE_SIZE = 256      # grid cells kept in memory
+MAX_HOURS_AHEAD = 96           # longest horizon any caller asks for
+
+_forecast_cache = TTLCache(maxsize=FORECAST_CACHE_SIZE, ttl=FORECAST_TTL_SECONDS)
+
+
+def snap_to_cell(lat, lon, resolution=GRID_RESOLUTION_DEG):
+    """
+    Snap coordinates to the center of their grid cell so nearby households share one forecast.
+    """
+    return (
+        round(round(float(lat) / resolution) * resolution, 4),
+        round(round(float(lon) / resolution) * resolution, 4)
+    )
+
+
+def current_forecast_hour():
+    return datetime.now().astimezone().replace(minute=0, second=0, microsecond=0)
+
+
+def get_forecast_dataframe_for_model(lat, lon, hours_ahead=6):
+    """
+    Cached drop-in for weatherAPIRequest.get_forecast_dataframe_for_model.
+
+    The forecast is fetched once per (grid cell, forecast hour) for the longest horizon and sliced
+    for each caller. Copies are returned because callers add feature columns in place.
+
+    Returns:
+        (pd.DataFrame, pd.DataFrame): forecast dates and model input, hours_ahead rows each
+    """
+    cell = snap_to_cell(lat, lon)
+    key = (cell, current_forecast_hour())
+
+    # Concurrent misses for one cell share a single upstream fetch
+    entry = _forecast_cache.get_or_compute(key, lambda: weather.get_forecast_dataframe_for_model(
+        lat=cell[0], lon=cell[1], hours_ahead=MAX_HOURS_AHEAD
+    ))
+
+    forecast_df, X_input = entry
+    return forecast_df.head(hours_ahead).copy(), X_input.head(hours_ahead).copy()
+
+
+def get_forecasts_for_locations(locations, hours_ahead=6):
+    """
+    Bulk version of get_forecast_dataframe_for_model: locations are deduplicated by grid cell and the
+    cells missing from the cache are fetched together in batched upstream requests.
+
+    Args:
+        locations (list[tuple]): (lat, lon) pairs, e.g. every household of a nightly recompute
+
+    Returns:
+        list[tuple]: (forecast_df, X_input) per location, in the order of `locations`
+    """
+    cells = [snap_to_cell(lat, lon) for lat, lon in locations]
+    hour = current_forecast_hour()
+    entries = {cell: _forecast_cache.get((cell, hour)) for cell in dict.fromkeys(cells)}
+
+    missing = [cell for cell, entry in entries.items() if entry is None]
+    if missing:
+        fetched = weather.get_forecast_dataframes_for_model(missing, hours_ahead=MAX_HOURS_AHEAD)
+        for cell, entry in zip(missing, fetched):
+            _forecast_cache.set((cell, hour), entry)
+            entries[cell] = entry
+
+    return [
+        (entries[cell][0].head(hours_ahead).copy(), entries[cell][1].head(hours_ahead).copy())
+        for cell in cells
+    ]
+
+
+def prefetch_forecasts(locations) -> int:
+    """
+    Warm the cache for many households at once (e.g. before the midnight recompute).
+
+    Returns:
+        int: number of distinct grid cells covered
+    """
+    locations = list(locations)
+    if not locations:
+        return 0
+    get_forecasts_for_locations(locations, hours_ahead=0)
+    cells = len({snap_to_cell(lat, lon) for lat, lon in locations})
+    if cells > FORECAST_CACHE_SIZE:
+        print(f"⚠ {cells} grid cells exceed the forecast cache size ({FORECAST_CACHE_SIZE}); older cells were evicted")
+    return cells
+
+
+def forecast_cache_stats() -> dict:
+    return _forecast_cache.stats()
+
+
+def clear_forecast_cache():
+    _forecast_cache.clear()
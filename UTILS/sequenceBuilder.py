@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+
+def contiguous_segments(timestamps, step: pd.Timedelta = pd.Timedelta(hours=1)) -> np.ndarray:
+    """
+    Label runs of consecutive hours: rows share a segment id while each timestamp is exactly
+    `step` after the previous one, and a new segment starts at every gap.
+
+    Args:
+        timestamps: sorted datetimes (Series, DatetimeIndex or array)
+        step (pd.Timedelta): expected spacing between consecutive rows
+
+    Returns:
+        np.ndarray: (len(timestamps),) int segment ids
+    """
+    times = pd.DatetimeIndex(timestamps)
+    if len(times) == 0:
+        return np.zeros(0, dtype=np.int64)
+    gaps = np.asarray((times[1:] - times[:-1]) != step)
+    return np.concatenate([[0], np.cumsum(gaps)])
+
+
+def sliding_windows(values: np.ndarray, seq_len: int, segment_ids: np.ndarray = None, target_offset: int = 0):
+    """
+    All seq_len-row windows of `values` as a strided view (no data is copied).
+
+    With `segment_ids`, only windows whose rows (plus `target_offset` rows after the window, e.g. the
+    row being predicted) stay inside one contiguous segment are kept; selecting them copies the
+    kept windows once.
+
+    Args:
+        values (np.ndarray): (N, F) rows in time order
+        seq_len (int): rows per window
+        segment_ids (np.ndarray | None): per-row segment id from contiguous_segments()
+        target_offset (int): extra rows after each window that must be in the same segment
+
+    Returns:
+        tuple: (windows (M, seq_len, F), start_indices (M,)) — window k covers rows
+        start_indices[k] .. start_indices[k] + seq_len - 1
+    """
+    values = np.asarray(values)
+    span = seq_len + target_offset
+    n_windows = len(values) - span + 1
+    if n_windows <= 0:
+        return np.empty((0, seq_len) + values.shape[1:], dtype=values.dtype), np.zeros(0, dtype=np.int64)
+
+    # (N - seq_len + 1, F, seq_len) view -> (.., seq_len, F)
+    windows = np.lib.stride_tricks.sliding_window_view(values, seq_len, axis=0).transpose(0, 2, 1)[:n_windows]
+    starts = np.arange(n_windows)
+
+    if segment_ids is not None:
+        segment_ids = np.asarray(segment_ids)
+        valid = segment_ids[starts] == segment_ids[starts + span - 1]
+        if not valid.all():
+            return windows[valid], starts[valid]
+    return windows, starts
+
+
+def create_sequences(df: pd.DataFrame, feature_cols, target_cols, seq_len: int = 6, time_col: str = "date"):
+    """
+    Training sequences: the seq_len hours before row i predict the targets of row i. Windows never
+    cross a gap in `time_col` (e.g. between two non-adjacent sampled days).
+
+    Returns:
+        tuple: (X (M, seq_len, F), y (M, T), target_indices (M,)) — target_indices are positions in df
+    """
+    segment_ids = contiguous_segments(df[time_col]) if time_col in df.columns else None
+    X, starts = sliding_windows(df[feature_cols].to_numpy(), seq_len, segment_ids, target_offset=1)
+    target_indices = starts + seq_len
+    return X, df[target_cols].to_numpy()[target_indices], target_indices
@@ -0,0 +1,70 @@
+import atexit
+import os
+import tempfile
+import threading
+import weakref
+
+SNAPSHOT_INTERVAL_SECONDS = 60
+
+
+def atomic_write(path: str, write_func):
+    """
+    Write a file through write_func(tmp_path) and move it into place in one step, so readers
+    never see a half-written snapshot.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    os.close(fd)
+    try:
+        write_func(tmp_path)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates owner-only files
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PeriodicSnapshot:
+    """
+    Background thread that calls flush() on every registered object every `interval` seconds and
+    once more at interpreter exit. Objects are held weakly and decide themselves whether they are dirty.
+    """
+
+    def __init__(self, interval: float = SNAPSHOT_INTERVAL_SECONDS):
+        self.interval = interval
+        self._targets = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self._stop = threading.Event()
+        atexit.register(self.flush_all)
+
+    def register(self, target):
+        with self._lock:
+            self._targets.add(target)
+            # Threads do not survive fork(), so a forked worker starts its own writer
+            if self._thread is None or self._thread_pid != os.getpid():
+                self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+
+    def flush_all(self):
+        with self._lock:
+            targets = list(self._targets)
+        for target in targets:
+            try:
+                target.flush()
+            except Exception as e:
+                print(f"⚠ Snapshot flush failed for {target!r}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush_all()
+
+    def stop(self):
+        self._stop.set()
+        self.flush_all()
+
+
+snapshot_writer = PeriodicSnapshot()
@@ -0,0 +1,170 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+
+from UTILS.sequenceBuilder import contiguous_segments, sliding_windows
+
+TARGET_COLUMNS = [
+    "boiler temp for 50 L with solar system",
+    "boiler temp for 50 L without solar system",
+    "boiler temp for 100 L with solar system",
+    "boiler temp for 100 L without solar system",
+    "boiler temp for 150 L with solar system",
+    "boiler temp for 150 L without solar system"
+]
+REQUIRED_FEATURES = [
+    "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature",
+    "precipitation", "cloud_cover", "wind_speed_10m", "is_day",
+    "direct_radiation", "surface_pressure", "weather_code", "weather_description",
+    "month_sin", "month_cos", "day_sin", "day_cos",
+    "hour_sin", "hour_cos"
+]
+SPLITS = {"train": (0, 70), "val": (70, 85), "test": (85, 100)}  # day-hash buckets out of 100
+CHUNK_SIZE = 100_000
+
+
+def add_time_features(df: pd.DataFrame) -> pd.DataFrame:
+    dates = df["date"].dt
+    df["month"] = dates.month.astype(np.float32)
+    df["dayofyear"] = dates.dayofyear.astype(np.float32)
+    df["hour"] = dates.hour.astype(np.float32)
+    df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
+    df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
+    df["day_sin"] = np.sin(2 * np.pi * df["dayofyear"] / 365)
+    df["day_cos"] = np.cos(2 * np.pi * df["dayofyear"] / 365)
+    df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
+    df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
+    return df
+
+
+def day_split(dates: pd.Series) -> np.ndarray:
+    """
+    Assign every row to train/val/test by hashing its calendar day, so a day always lands in the same
+    split no matter which chunk (or file) it is read from.
+    """
+    days = dates.dt.strftime("%Y-%m-%d")
+    buckets = {day: zlib.crc32(day.encode()) % 100 for day in days.unique()}
+    bucket = days.map(buckets).to_numpy()
+    split = np.empty(len(bucket), dtype=object)
+    for name, (low, high) in SPLITS.items():
+        split[(bucket >= low) & (bucket < high)] = name
+    return split
+
+
+class StreamingPreprocessor:
+    """
+    Streams a historical weather + boiler CSV in chunks with compact dtypes.
+
+    fit() makes one pass over the file: it counts weather descriptions (to keep the top-k as one-hot
+    columns, like dataTraining.py) and fits the MinMax scalers with partial_fit on the training days.
+    windows() then yields scaled 6-hour windows chunk by chunk, carrying the last rows of each chunk
+    over to the next so no window is lost at chunk borders.
+
+    Args:
+        csv_path (str): historical CSV with a `date` column
+        chunksize (int): rows read per chunk
+        top_k (int): weather descriptions kept as one-hot columns (the rest become "Other")
+    """
+
+    def __init__(self, csv_path: str, chunksize: int = CHUNK_SIZE, top_k: int = 10):
+        self.csv_path = csv_path
+        self.chunksize = chunksize
+        self.top_k = top_k
+        self.features = None
+        self.top_weather = None
+        self.weather_values = None
+        self.scaler_x = MinMaxScaler()
+        self.scaler_y = MinMaxScaler()
+
+        header = pd.read_csv(csv_path, nrows=0).columns
+        self.dtypes = {col: np.float32 for col in header if col not in ("date", "weather_description")}
+        self.dtypes["weather_description"] = "category"
+
+    def chunks(self):
+        for chunk in pd.read_csv(self.csv_path, chunksize=self.chunksize, dtype=self.dtypes, parse_dates=["date"]):
+            chunk = add_time_features(chunk)
+            yield chunk.dropna(subset=REQUIRED_FEATURES + TARGET_COLUMNS)
+
+    def _one_hot(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        desc = chunk["weather_description"].astype(object)
+        desc = desc.where(desc.isin(self.top_weather), "Other")
+        for name in self.weather_values:
+            chunk[f"weather_description_{name}"] = (desc == name).astype(np.float32)
+        return chunk.drop(columns="weather_description")
+
+    def fit(self):
+        """
+        Streaming first pass: weather description counts over all rows and scaler statistics over training days.
+        """
+        counts = pd.Series(dtype=np.int64)
+        numeric_min, numeric_max = None, None
+        self.scaler_y = MinMaxScaler()
+
+        for chunk in self.chunks():
+            counts = counts.add(chunk["weather_description"].astype(object).value_counts(), fill_value=0)
+            train = chunk[day_split(chunk["date"]) == "train"]
+            if train.empty:
+                continue
+            numeric = train.drop(columns=["date", "weather_description"] + TARGET_COLUMNS)
+            numeric_min = numeric.min() if numeric_min is None else np.fmin(numeric_min, numeric.min())
+            numeric_max = numeric.max() if numeric_max is None else np.fmax(numeric_max, numeric.max())
+            self.scaler_y.partial_fit(train[TARGET_COLUMNS])
+
+        if numeric_min is None:
+            raise ValueError(f"❌ No training rows found in {self.csv_path}")
+
+        self.top_weather = counts.nlargest(self.top_k).index.tolist()
+        has_other = counts.drop(self.top_weather).sum() > 0
+        self.weather_values = self.top_weather + (["Other"] if has_other else [])
+
+        # One-hot columns are only known after counting; their range is 0..1 by construction
+        bounds = pd.DataFrame([numeric_min, numeric_max])
+        for name in self.weather_values:
+            bounds[f"weather_description_{name}"] = [0.0, 1.0]
+        self.features = sorted(bounds.columns)
+        self.scaler_x = MinMaxScaler().partial_fit(bounds[self.features])
+        print(f"📊 Streaming fit: {len(self.features)} features, top weather: {self.top_weather}")
+        return self
+
+    def windows(self, split: str, seq_len: int = 6):
+        """
+        Yield (X (M, seq_len, F), y (M, T)) float32 blocks of windows for one split, chunk by chunk.
+        The seq_len hours before a row predict that row; windows never cross a gap in time.
+        """
+        carry_x = np.zeros((0, len(self.features)), dtype=np.float32)
+        carry_y = np.zeros((0, len(TARGET_COLUMNS)), dtype=np.float32)
+        carry_dates = None
+
+        for chunk in self.chunks():
+            chunk = chunk[day_split(chunk["date"]) == split]
+            if chunk.empty:
+                continue
+            chunk = self._one_hot(chunk)
+            x = np.vstack([carry_x, self.scaler_x.transform(chunk[self.features]).astype(np.float32)])
+            y = np.vstack([carry_y, self.scaler_y.transform(chunk[TARGET_COLUMNS]).astype(np.float32)])
+            dates = chunk["date"] if carry_dates is None else pd.concat([carry_dates, chunk["date"]])
+
+            X, starts = sliding_windows(x, seq_len, contiguous_segments(dates), target_offset=1)
+            if len(starts):
+                yield X, y[starts + seq_len]
+
+            carry_x, carry_y, carry_dates = x[-seq_len:], y[-seq_len:], dates.iloc[-seq_len:]
+
+    def dataset(self, split: str, seq_len: int = 6, batch_size: int = 32, shuffle_buffer: int = 10_000):
+        """
+        tf.data pipeline over windows(): windows are produced lazily, shuffled within a buffer,
+        batched and prefetched while the model trains.
+        """
+        import tensorflow as tf
+
+        signature = (
+            tf.TensorSpec(shape=(None, seq_len, len(self.features)), dtype=tf.float32),
+            tf.TensorSpec(shape=(None, len(TARGET_COLUMNS)), dtype=tf.float32),
+        )
+        ds = tf.data.Dataset.from_generator(lambda: self.windows(split, seq_len), output_signature=signature)
+        ds = ds.unbatch()
+        if shuffle_buffer:
+            ds = ds.shuffle(shuffle_buffer)
+        return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
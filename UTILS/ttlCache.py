@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class _Flight:
+    # One in-progress computation that concurrent callers of the same key wait for
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory LRU cache whose entries also expire after a fixed time-to-live.
+
+    Args:
+        maxsize (int): maximum number of entries kept; the least recently used one is evicted first
+        ttl (float): seconds an entry stays valid after it was stored
+        clock (callable): monotonic time source (overridable for simulations)
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 3600, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> _Flight
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value of `key`, computing it on a miss.
+
+        Concurrent misses for the same key are coalesced: the first caller runs `compute()` and the others
+        wait for its result instead of computing it again. If `compute()` raises, every waiter gets the
+        exception and nothing is cached.
+
+        Args:
+            key: cache key
+            compute (callable): builds the value, called without arguments
+
+        Returns:
+            the cached or freshly computed value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            # Another caller may have stored it between get() and here
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > self._clock():
+                return entry[1]
+
+            flight = self._in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._in_flight[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+            self.set(key, flight.value)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """
+        Drop every entry whose key matches `predicate(key)`, e.g. all entries of one user.
+        """
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
@@ -1,158 +1,337 @@
+import os
+import threading
+
+import numpy as np
 import openmeteo_requests
 import requests_cache
 import pandas as pd
-from retry_requests import retry
-from datetime import datetime, timezone
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+from datetime import datetime, timedelta, timezone
+
+from UTILS.ttlCache import TTLCache
+
+# === Client settings ===
+WEATHER_CACHE_BACKEND_ENV = "WEATHER_CACHE_BACKEND"  # "sqlite" (default, shared on disk) or "memory"
+HTTP_CACHE_NAME = ".cache"
+HTTP_CACHE_SECONDS = 3600
+HTTP_POOL_SIZE = 16              # keep-alive connections kept per host
+COORD_DECIMALS = 4               # ~11 m; coordinates closer than this share a parsed forecast
+PARSED_CACHE_SIZE = 128
+OPEN_METEO_URL_ENV = "OPEN_METEO_URL"  # e.g. a local tests.openmeteo_stub server
+DEFAULT_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+BULK_BATCH_SIZE = 100            # locations per upstream request
+
+HOURLY_VARIABLES = [
+    "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature",
+    "precipitation", "cloud_cover", "wind_speed_10m", "is_day", "weather_code"
+]
+REQUIRED_WEATHER_DESC = [
+    'weather_description_Clear sky', 'weather_description_Dense drizzle',
+    'weather_description_Heavy rain', 'weather_description_Light drizzle',
+    'weather_description_Mainly clear', 'weather_description_Moderate drizzle',
+    'weather_description_Moderate rain', 'weather_description_Overcast',
+    'weather_description_Partly cloudy', 'weather_description_Slight rain'
+]
+ENERGY_COLUMNS = [
+    'energy consumption for 50L boiler with solar system',
+    'energy consumption for 50L boiler without solar system',
+    'energy consumption for 100L boiler with solar system',
+    'energy consumption for 100L boiler without solar system',
+    'energy consumption for 150L boiler with solar system',
+    'energy consumption for 150L boiler without solar system'
+]
+FINAL_COLUMNS = [
+    'temperature_2m', 'relative_humidity_2m', 'dew_point_2m', 'apparent_temperature',
+    'precipitation', 'cloud_cover', 'wind_speed_10m', 'is_day', 'direct_radiation',
+    'surface_pressure', 'weather_code'
+] + ENERGY_COLUMNS + REQUIRED_WEATHER_DESC
+
+_client = None
+_client_lock = threading.Lock()
+_parsed_cache = TTLCache(maxsize=PARSED_CACHE_SIZE, ttl=HTTP_CACHE_SECONDS)
+
+
+def cache_backend_from_env() -> str:
+    backend = os.environ.get(WEATHER_CACHE_BACKEND_ENV, "sqlite").strip().lower()
+    if backend not in ("sqlite", "memory"):
+        print(f"⚠ Unknown {WEATHER_CACHE_BACKEND_ENV}={backend!r}, using sqlite")
+        return "sqlite"
+    return backend
+
+
+def _build_client(backend: str):
+    session = requests_cache.CachedSession(HTTP_CACHE_NAME, backend=backend, expire_after=HTTP_CACHE_SECONDS)
+
+    # One pooled adapter with the same retry policy retry_requests used (5 retries, 0.2 backoff)
+    retries = Retry(total=5, read=5, connect=5, backoff_factor=0.2,
+                    status_forcelist=(500, 502, 504), allowed_methods=None)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+    for prefix in ("http://", "https://"):
+        session.mount(prefix, adapter)
+    return openmeteo_requests.Client(session=session)
+
+
+def get_client(backend: str = None):
+    """
+    Shared Open-Meteo client, created once per process.
+
+    The session keeps its TCP/TLS connections alive between calls and its HTTP cache open, instead of
+    rebuilding both on every forecast request.
+
+    Args:
+        backend (str | None): "sqlite" or "memory" for the HTTP cache (default: $WEATHER_CACHE_BACKEND)
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client(backend or cache_backend_from_env())
+    return _client
+
+
+def reset_client():
+    """
+    Drop the shared client and parsed forecasts (e.g. after changing the cache backend).
+    """
+    global _client
+    with _client_lock:
+        _client = None
+    _parsed_cache.clear()
+
+
+def current_forecast_hour() -> datetime:
+    """
+    Start of the current UTC hour. Parsed forecasts are keyed by it and HTTP responses expire at its end,
+    so neither cache layer serves a forecast from a previous hour.
+    """
+    return datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def normalize_coordinates(lat, lon, decimals=COORD_DECIMALS):
+    return round(float(lat), decimals), round(float(lon), decimals)
+
+
+def weather_cache_stats() -> dict:
+    return _parsed_cache.stats()
+
 
 def get_forecast_dataframe_for_model(lat, lon, hours_ahead=6):
-    import openmeteo_requests
-    import requests_cache
-    import pandas as pd
-    from retry_requests import retry
-    from datetime import datetime, timezone
-
-    # === Setup API client
-    cache_session = requests_cache.CachedSession('.cache', expire_after=3600)
-    retry_session = retry(cache_session, retries=5, backoff_factor=0.2)
-    openmeteo = openmeteo_requests.Client(session=retry_session)
-
-    # === API parameters
-    url = "https://api.open-meteo.com/v1/forecast"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "hourly": [
-            "temperature_2m", "relative_humidity_2m", "dew_point_2m", "apparent_temperature",
-            "precipitation", "cloud_cover", "wind_speed_10m", "is_day", "weather_code"
-        ],
-        "minutely_15": ["direct_radiation"],
-        "current": ["surface_pressure"],
-        "timezone": "auto"
-    }
-
-    responses = openmeteo.weather_api(url, params=params)
-    response = responses[0]
-
-    # === Extract current surface pressureF
-    current = response.Current()
-    surface_pressure = current.Variables(0).Value()
-
-    # === Extract and average radiation
-    minutely = response.Minutely15()
-    rad_values = minutely.Variables(0).ValuesAsNumpy()
-    rad_times = pd.date_range(
-        start=pd.to_datetime(minutely.Time(), unit="s", utc=True),
-        end=pd.to_datetime(minutely.TimeEnd(), unit="s", utc=True),
-        freq=pd.Timedelta(seconds=minutely.Interval()),
-        inclusive="left"
-    )
-    rad_df = pd.DataFrame({"date": rad_times, "direct_radiation": rad_values})
-    rad_df["date"] = rad_df["date"].dt.tz_convert("Asia/Jerusalem")
-    rad_df = rad_df.resample("1h", on="date").mean().reset_index()
+    """
+    Model-ready forecast for the next hours_ahead hours.
 
-    # === Extract hourly weather data
-    hourly = response.Hourly()
-    times = pd.date_range(
-        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-        freq=pd.Timedelta(seconds=hourly.Interval()),
-        inclusive="left"
-    ).tz_convert("Asia/Jerusalem")  # ✅ convert to local time
+    The parsed forecast of a location is kept in memory until the end of the hour, so repeated calls only
+    filter it.
 
-    df = pd.DataFrame({
-        "date": times,
-        "temperature_2m": hourly.Variables(0).ValuesAsNumpy(),
-        "relative_humidity_2m": hourly.Variables(1).ValuesAsNumpy(),
-        "dew_point_2m": hourly.Variables(2).ValuesAsNumpy(),
-        "apparent_temperature": hourly.Variables(3).ValuesAsNumpy(),
-        "precipitation": hourly.Variables(4).ValuesAsNumpy(),
-        "cloud_cover": hourly.Variables(5).ValuesAsNumpy(),
-        "wind_speed_10m": hourly.Variables(6).ValuesAsNumpy(),
-        "is_day": hourly.Variables(7).ValuesAsNumpy(),
-        "surface_pressure": surface_pressure,
-        "weather_code": hourly.Variables(8).ValuesAsNumpy()
-    })
-
-    df["weather_description"] = df["weather_code"].apply(_map_weather_code_to_description)
-
-    # === Merge radiation
-    df = pd.merge(df, rad_df, on="date", how="left")
-
-    # === One-hot encode weather description
-    df = pd.get_dummies(df, columns=["weather_description"])
-
-    # === Ensure fixed one-hot columns
-    required_weather_desc = [
-        'weather_description_Clear sky', 'weather_description_Dense drizzle',
-        'weather_description_Heavy rain', 'weather_description_Light drizzle',
-        'weather_description_Mainly clear', 'weather_description_Moderate drizzle',
-        'weather_description_Moderate rain', 'weather_description_Overcast',
-        'weather_description_Partly cloudy', 'weather_description_Slight rain'
-    ]
-    for col in required_weather_desc:
-        if col not in df.columns:
-            df[col] = 0.0
-
-    # === Energy dummy features
-    energy_cols = [
-        'energy consumption for 50L boiler with solar system',
-        'energy consumption for 50L boiler without solar system',
-        'energy consumption for 100L boiler with solar system',
-        'energy consumption for 100L boiler without solar system',
-        'energy consumption for 150L boiler with solar system',
-        'energy consumption for 150L boiler without solar system'
-    ]
-    for col in energy_cols:
-        df[col] = 0.0
-
-    # === Final column list
-    final_columns = [
-        'temperature_2m', 'relative_humidity_2m', 'dew_point_2m', 'apparent_temperature',
-        'precipitation', 'cloud_cover', 'wind_speed_10m', 'is_day', 'direct_radiation',
-        'surface_pressure', 'weather_code'
-    ] + energy_cols + required_weather_desc
+    Returns:
+        (pd.DataFrame, pd.DataFrame): forecast dates and model input, hours_ahead rows each
+    """
+    return get_forecast_dataframes_for_model([(lat, lon)], hours_ahead)[0]
+
+
+def get_forecast_dataframes_for_model(locations, hours_ahead=6):
+    """
+    Bulk version of get_forecast_dataframe_for_model for many households.
+
+    Locations are deduplicated by normalized coordinates and only the ones missing from the parsed cache
+    are fetched, BULK_BATCH_SIZE locations per upstream request.
+
+    Args:
+        locations (list[tuple]): (lat, lon) pairs
 
+    Returns:
+        list[tuple]: (forecast_df, X_input) per location, in the order of `locations`
+    """
+    coords = [normalize_coordinates(lat, lon) for lat, lon in locations]
+    hour = current_forecast_hour()
+    frames = {c: _parsed_cache.get((c, hour)) for c in dict.fromkeys(coords)}
+    missing = [c for c, df in frames.items() if df is None]
+    if missing:
+        for c, df in zip(missing, fetch_forecast_frames(missing)):
+            _parsed_cache.set((c, hour), df)
+            frames[c] = df
+
+    return [_model_input(frames[c], hours_ahead) for c in coords]
+
+
+def _model_input(df, hours_ahead):
     # === Filter from now and limit
-    df = df.sort_values("date").reset_index(drop=True)
     df = df[df["date"] >= datetime.now().astimezone()].head(hours_ahead)
 
     forecast_df = df[["date"]].copy()
-    X_input = df[final_columns].copy()
+    X_input = df[FINAL_COLUMNS].copy()
 
     return forecast_df, X_input
 
+
+def forecast_url() -> str:
+    return os.environ.get(OPEN_METEO_URL_ENV, DEFAULT_FORECAST_URL)
+
+
+def fetch_forecast_frame(lat, lon):
+    """
+    Fetch and parse the full Open-Meteo forecast of one location.
+
+    Returns:
+        pd.DataFrame: hourly rows in local time, sorted, with a `date` column and FINAL_COLUMNS
+    """
+    return fetch_forecast_frames([(lat, lon)])[0]
+
+
+def fetch_forecast_frames(locations, batch_size=BULK_BATCH_SIZE):
+    """
+    Fetch and parse the full forecasts of many locations, batch_size locations per request
+    (Open-Meteo takes comma-separated coordinates and answers with one response per location).
+
+    Returns:
+        list[pd.DataFrame]: one frame per location, in the order of `locations`
+    """
+    openmeteo = get_client()
+    # Cached HTTP responses expire at the end of the hour, together with the parsed frames built from them
+    expires_at = current_forecast_hour() + timedelta(hours=1)
+    frames = []
+    for i in range(0, len(locations), batch_size):
+        batch = locations[i:i + batch_size]
+
+        # === API parameters
+        params = {
+            "latitude": ",".join(str(lat) for lat, _ in batch),
+            "longitude": ",".join(str(lon) for _, lon in batch),
+            "hourly": HOURLY_VARIABLES,
+            "minutely_15": ["direct_radiation"],
+            "current": ["surface_pressure"],
+            "timezone": "auto"
+        }
+
+        responses = openmeteo.weather_api(forecast_url(), params=params, expire_after=expires_at)
+        if len(responses) != len(batch):
+            raise ValueError(f"❌ Open-Meteo returned {len(responses)} forecasts for {len(batch)} locations")
+
+        for response in responses:
+            times, features = parse_forecast_response(response)
+            df = pd.DataFrame(features, columns=FINAL_COLUMNS)
+            df.insert(0, "date", times)
+            frames.append(df)
+
+    return frames
+
+
+def hourly_mean(values, start, interval, hour_start, n_hours, hour_interval=3600):
+    """
+    Average sub-hourly values (e.g. 15-minute radiation) into the hourly grid with one reshape-mean.
+
+    Slots outside the sub-hourly range count as missing; hours without any value are NaN.
+
+    Args:
+        values (np.ndarray): sub-hourly values starting at `start` (unix seconds), `interval` seconds apart
+        hour_start (int): unix seconds of the first hourly row
+        n_hours (int): rows in the hourly grid
+
+    Returns:
+        np.ndarray: (n_hours,) float32 hourly means
+    """
+    steps = hour_interval // interval
+    offset = (start - hour_start) // interval
+    slots = np.full(n_hours * steps, np.nan, dtype=np.float32)
+    lo, hi = max(offset, 0), min(offset + len(values), len(slots))
+    if hi > lo:
+        slots[lo:hi] = values[lo - offset:hi - offset]
+
+    slots = slots.reshape(n_hours, steps)
+    valid = ~np.isnan(slots)
+    count = valid.sum(axis=1)
+    total = np.where(valid, slots, 0).sum(axis=1)
+    return np.divide(total, count, out=np.full(n_hours, np.nan, dtype=np.float32), where=count > 0)
+
+
+def parse_forecast_response(response):
+    """
+    Parse one Open-Meteo response straight into the model's fixed feature matrix.
+
+    Returns:
+        (pd.DatetimeIndex, np.ndarray): local hourly times and a (H, len(FINAL_COLUMNS)) float32 matrix
+    """
+    hourly = response.Hourly()
+    start, interval = hourly.Time(), hourly.Interval()
+    n_hours = -(-(hourly.TimeEnd() - start) // interval)
+    times = pd.date_range(
+        start=pd.to_datetime(start, unit="s", utc=True),
+        periods=n_hours,
+        freq=pd.Timedelta(seconds=interval)
+    ).tz_convert("Asia/Jerusalem")  # ✅ convert to local time
+
+    features = np.zeros((n_hours, len(FINAL_COLUMNS)), dtype=np.float32)
+    for i, name in enumerate(HOURLY_VARIABLES):
+        features[:, _COLUMN_INDEX[name]] = hourly.Variables(i).ValuesAsNumpy()
+
+    # === Current surface pressure
+    features[:, _COLUMN_INDEX["surface_pressure"]] = response.Current().Variables(0).Value()
+
+    # === 15-minute radiation -> hourly mean
+    minutely = response.Minutely15()
+    features[:, _COLUMN_INDEX["direct_radiation"]] = hourly_mean(
+        minutely.Variables(0).ValuesAsNumpy(), minutely.Time(), minutely.Interval(), start, n_hours, interval
+    )
+
+    # === Weather code -> one-hot column through the lookup array (unknown codes count as clear sky)
+    codes = np.nan_to_num(features[:, _COLUMN_INDEX["weather_code"]], nan=-1).astype(np.int64)
+    known = (codes >= 0) & (codes < len(WEATHER_CODE_COLUMNS))
+    columns = np.where(known, WEATHER_CODE_COLUMNS[np.clip(codes, 0, len(WEATHER_CODE_COLUMNS) - 1)],
+                       WEATHER_CODE_COLUMNS[0])
+    rows = np.flatnonzero(columns >= 0)
+    features[rows, columns[rows]] = 1.0
+
+    return times, features
+
+
 def _map_weather_code_to_description(code):
     """
     Map Open-Meteo weather_code to text description (simplified).
     """
-    mapping = {
-        0: "Clear sky",
-        1: "Mainly clear",
-        2: "Partly cloudy",
-        3: "Overcast",
-        45: "Fog",
-        48: "Depositing rime fog",
-        51: "Light drizzle",
-        53: "Moderate drizzle",
-        55: "Dense drizzle",
-        56: "Light freezing drizzle",
-        57: "Dense freezing drizzle",
-        61: "Slight rain",
-        63: "Moderate rain",
-        65: "Heavy rain",
-        66: "Light freezing rain",
-        67: "Heavy freezing rain",
-        71: "Slight snow fall",
-        73: "Moderate snow fall",
-        75: "Heavy snow fall",
-        77: "Snow grains",
-        80: "Slight rain showers",
-        81: "Moderate rain showers",
-        82: "Violent rain showers",
-        85: "Slight snow showers",
-        86: "Heavy snow showers",
-        95: "Thunderstorm",
-        96: "Thunderstorm with slight hail",
-        99: "Thunderstorm with heavy hail"
-    }
-    return mapping.get(int(code), "Clear sky")
\ No newline at end of file
+    return WEATHER_CODE_DESCRIPTIONS.get(int(code), "Clear sky")
+
+
+WEATHER_CODE_DESCRIPTIONS = {
+    0: "Clear sky",
+    1: "Mainly clear",
+    2: "Partly cloudy",
+    3: "Overcast",
+    45: "Fog",
+    48: "Depositing rime fog",
+    51: "Light drizzle",
+    53: "Moderate drizzle",
+    55: "Dense drizzle",
+    56: "Light freezing drizzle",
+    57: "Dense freezing drizzle",
+    61: "Slight rain",
+    63: "Moderate rain",
+    65: "Heavy rain",
+    66: "Light freezing rain",
+    67: "Heavy freezing rain",
+    71: "Slight snow fall",
+    73: "Moderate snow fall",
+    75: "Heavy snow fall",
+    77: "Snow grains",
+    80: "Slight rain showers",
+    81: "Moderate rain showers",
+    82: "Violent rain showers",
+    85: "Slight snow showers",
+    86: "Heavy snow showers",
+    95: "Thunderstorm",
+    96: "Thunderstorm with slight hail",
+    99: "Thunderstorm with heavy hail"
+}
+
+
+def _weather_code_columns():
+    # weather_code (0..99) -> column in FINAL_COLUMNS of its one-hot description, -1 if it has none
+    lookup = np.full(100, -1, dtype=np.int64)
+    for code in range(len(lookup)):
+        name = f"weather_description_{_map_weather_code_to_description(code)}"
+        if name in FINAL_COLUMNS:
+            lookup[code] = FINAL_COLUMNS.index(name)
+    return lookup
+
+
+_COLUMN_INDEX = {name: i for i, name in enumerate(FINAL_COLUMNS)}
+WEATHER_CODE_COLUMNS = _weather_code_columns()
@@ -0,0 +1,166 @@
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import flatbuffers
+import numpy as np
+
+# Field slots of the openmeteo_sdk flatbuffer schema (the SDK only ships readers, so responses are
+# assembled with the generic flatbuffers.Builder)
+_RESPONSE_FIELDS = 13            # WeatherApiResponse: ... current=9, hourly=11, minutely_15=12
+_RESPONSE_LATITUDE, _RESPONSE_LONGITUDE = 0, 1
+_RESPONSE_CURRENT, _RESPONSE_HOURLY, _RESPONSE_MINUTELY_15 = 9, 11, 12
+_SERIES_FIELDS = 4               # VariablesWithTime: time, time_end, interval, variables
+_VARIABLE_FIELDS = 4             # VariableWithValues: variable, unit, value, values
+
+FORECAST_DAYS = 7
+MINUTELY_15_DAYS = 4
+
+
+def _variable(builder, value=None, values=None):
+    values_offset = builder.CreateNumpyVector(np.asarray(values, dtype=np.float32)) if values is not None else None
+    builder.StartObject(_VARIABLE_FIELDS)
+    if value is not None:
+        builder.PrependFloat32Slot(2, float(value), 0.0)
+    if values_offset is not None:
+        builder.PrependUOffsetTRelativeSlot(3, values_offset, 0)
+    return builder.EndObject()
+
+
+def _series(builder, start, interval, variables):
+    # Variables must be finished before the table that points to them
+    length = len(variables[0][1]) if variables[0][1] is not None else 1
+    offsets = [_variable(builder, value, values) for value, values in variables]
+    builder.StartVector(4, len(offsets), 4)
+    for offset in reversed(offsets):
+        builder.PrependUOffsetTRelative(offset)
+    vector = builder.EndVector()
+
+    builder.StartObject(_SERIES_FIELDS)
+    builder.PrependInt64Slot(0, start, 0)
+    builder.PrependInt64Slot(1, start + interval * length, 0)
+    builder.PrependInt32Slot(2, interval, 0)
+    builder.PrependUOffsetTRelativeSlot(3, vector, 0)
+    return builder.EndObject()
+
+
+def build_response(lat: float, lon: float, now: float = None) -> bytes:
+    """
+    One size-prefixed WeatherApiResponse with deterministic fake weather for (lat, lon), shaped like the
+    request made by UTILS.weatherAPIRequest (9 hourly variables, 15-minute radiation, current pressure).
+    """
+    rng = np.random.default_rng(abs(hash((round(lat, 4), round(lon, 4)))) % (2 ** 32))
+    start = int(now if now is not None else time.time()) // 86400 * 86400
+    hours = 24 * FORECAST_DAYS
+    hour_of_day = np.arange(hours) % 24
+    slots = 4 * 24 * MINUTELY_15_DAYS
+
+    temperature = 22 + 8 * np.sin(np.pi * (hour_of_day - 9) / 12) + rng.normal(0, 1, hours)
+    hourly = [
+        temperature,                                          # temperature_2m
+        rng.uniform(30, 90, hours),                           # relative_humidity_2m
+        temperature - rng.uniform(2, 10, hours),              # dew_point_2m
+        temperature + rng.normal(0, 1, hours),                # apparent_temperature
+        rng.exponential(0.2, hours) * (rng.random(hours) < 0.1),  # precipitation
+        rng.uniform(0, 100, hours),                           # cloud_cover
+        rng.uniform(0, 25, hours),                            # wind_speed_10m
+        ((hour_of_day >= 6) & (hour_of_day < 19)).astype(np.float32),  # is_day
+        rng.choice([0, 1, 2, 3, 51, 61, 63], size=hours)      # weather_code
+    ]
+    slot_hour = (np.arange(slots) // 4) % 24
+    radiation = np.clip(850 * np.sin(np.pi * (slot_hour - 6) / 12), 0, None) * rng.uniform(0.6, 1.0, slots)
+
+    builder = flatbuffers.Builder(1024)
+    current = _series(builder, start, 0, [(rng.uniform(1005, 1020), None)])
+    hourly_table = _series(builder, start, 3600, [(None, values) for values in hourly])
+    minutely = _series(builder, start, 900, [(None, radiation)])
+
+    builder.StartObject(_RESPONSE_FIELDS)
+    builder.PrependFloat32Slot(_RESPONSE_LATITUDE, lat, 0.0)
+    builder.PrependFloat32Slot(_RESPONSE_LONGITUDE, lon, 0.0)
+    builder.PrependUOffsetTRelativeSlot(_RESPONSE_CURRENT, current, 0)
+    builder.PrependUOffsetTRelativeSlot(_RESPONSE_HOURLY, hourly_table, 0)
+    builder.PrependUOffsetTRelativeSlot(_RESPONSE_MINUTELY_15, minutely, 0)
+    builder.Finish(builder.EndObject())
+
+    message = bytes(builder.Output())
+    return len(message).to_bytes(4, byteorder="little") + message
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        try:
+            lats = [float(v) for v in query["latitude"][0].split(",")]
+            lons = [float(v) for v in query["longitude"][0].split(",")]
+            if len(lats) != len(lons):
+                raise ValueError("latitude and longitude lists differ in length")
+        except (KeyError, ValueError) as e:
+            body = f'{{"error": true, "reason": "{e}"}}'.encode()
+            self.send_response(400)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.server.stub.record(len(lats))
+        body = b"".join(build_response(lat, lon) for lat, lon in zip(lats, lons))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class OpenMeteoStub:
+    """
+    Local stand-in for the Open-Meteo forecast endpoint that serves fake flatbuffer responses for any
+    comma-separated list of coordinates.
+
+    Point the client at it with OPEN_METEO_URL=stub.url (and WEATHER_CACHE_BACKEND=memory so the
+    on-disk HTTP cache is untouched). Used as a context manager it runs on a free port in a background thread.
+
+    Args:
+        port (int): 0 picks a free port
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.server = ThreadingHTTPServer((host, port), _StubHandler)
+        self.server.stub = self
+        self.url = f"http://{host}:{self.server.server_address[1]}/v1/forecast"
+        self.requests = 0
+        self.locations = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def record(self, n_locations: int):
+        with self._lock:
+            self.requests += 1
+            self.locations += n_locations
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    stub = OpenMeteoStub(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8089)
+    print(f"🌤 Open-Meteo stub serving on {stub.url}")
+    stub.server.serve_forever()
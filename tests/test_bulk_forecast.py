@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+pytest.importorskip("openmeteo_requests")
+import UTILS.weatherAPIRequest as weather
+import UTILS.forecastCache as forecast_cache
+from tests.openmeteo_stub import OpenMeteoStub
+
+LOCATIONS = [(31.77, 35.21), (32.08, 34.78), (32.79, 34.99), (29.56, 34.95), (31.25, 34.79)]
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setenv("WEATHER_CACHE_BACKEND", "memory")
+    with OpenMeteoStub() as server:
+        monkeypatch.setenv(weather.OPEN_METEO_URL_ENV, server.url)
+        weather.reset_client()
+        forecast_cache.clear_forecast_cache()
+        yield server
+    weather.reset_client()
+    forecast_cache.clear_forecast_cache()
+
+
+def test_fetch_forecast_frames_batches_locations(stub):
+    frames = weather.fetch_forecast_frames(LOCATIONS, batch_size=2)
+
+    assert stub.requests == 3
+    assert len(frames) == len(LOCATIONS)
+    assert list(frames[0].columns) == ["date"] + weather.FINAL_COLUMNS
+
+    weather.reset_client()  # drop the HTTP cache so the single fetches reach the stub
+    for (lat, lon), frame in zip(LOCATIONS, frames):
+        pd.testing.assert_frame_equal(frame, weather.fetch_forecast_frame(lat, lon))
+
+
+def test_get_forecasts_for_locations_dedupes_grid_cells(stub):
+    lat, lon = forecast_cache.snap_to_cell(*LOCATIONS[0])
+    # Three households in one grid cell, one elsewhere
+    locations = [(lat, lon), (lat + 0.001, lon + 0.001), (lat - 0.001, lon), LOCATIONS[1]]
+
+    forecasts = forecast_cache.get_forecasts_for_locations(locations, hours_ahead=6)
+
+    assert stub.requests == 1
+    assert stub.locations == 2
+    assert len(forecasts) == len(locations)
+    for forecast_df, X_input in forecasts:
+        assert len(forecast_df) == 6 and len(X_input) == 6
+    pd.testing.assert_frame_equal(forecasts[0][1], forecasts[1][1])
+
+    # A second call is served from the forecast cache
+    forecast_cache.get_forecasts_for_locations(locations, hours_ahead=6)
+    assert stub.requests == 1
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from AGENTS.numpy_policy import NumpyPolicy, load_policy, verify_parity
+
+keras = pytest.importorskip("tensorflow.keras")
+
+STATE_SIZE = 7
+ACTION_SIZE = 2
+
+
+def build_q_network(seed=0):
+    # Same shape as DQLAgent._build_model: 7 -> 128 -> 128 -> 2
+    keras.utils.set_random_seed(seed)
+    return keras.models.Sequential([
+        keras.layers.Input(shape=(STATE_SIZE,)),
+        keras.layers.Dense(128, activation="relu"),
+        keras.layers.Dense(128, activation="relu"),
+        keras.layers.Dense(ACTION_SIZE, activation="linear"),
+    ])
+
+
+def sample_states(n=1024, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 100, n),
+        rng.uniform(5, 35, n),
+        rng.integers(0, 24, n),
+        rng.integers(0, 2, n),
+        rng.integers(1, 6, n),
+        rng.choice([50, 100, 150], n),
+        rng.uniform(55, 70, n),
+    ]).astype(np.float32)
+
+
+def test_exported_policy_matches_keras_argmax(tmp_path):
+    model = build_q_network()
+    model_path = str(tmp_path / "dql_model.h5")
+    model.save(model_path)
+
+    policy = load_policy(model_path, str(tmp_path / "dql_model.npz"))
+
+    states = sample_states()
+    keras_q = np.asarray(model.predict_on_batch(states))
+    numpy_q = policy.q_values(states)
+    np.testing.assert_allclose(numpy_q, keras_q, rtol=1e-4, atol=1e-4)
+    assert np.array_equal(np.argmax(numpy_q, axis=1), np.argmax(keras_q, axis=1))
+    assert all(policy.act(state) == int(np.argmax(q)) for state, q in zip(states[:32], keras_q[:32]))
+
+
+def test_verify_parity_raises_on_mismatch():
+    model = build_q_network()
+    policy = NumpyPolicy.from_keras(model)
+    # Swapping the output units flips every greedy action
+    policy.kernels[-1] = policy.kernels[-1][:, ::-1].copy()
+    policy.biases[-1] = policy.biases[-1][::-1].copy()
+
+    with pytest.raises(ValueError):
+        verify_parity(model, policy)
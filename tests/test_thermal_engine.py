@@ -0,0 +1,68 @@
+import os
+import sys
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from DVCS.Boiler import BoilerManager, BOILER_SIZES
+from DVCS.ThermalEngine import ThermalEngine
+
+HOURS = 48
+
+
+def synthetic_weather(month=6, seed=0):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(datetime(2025, month, 1), periods=HOURS, freq="h")
+    hours, months = times.hour.to_numpy(), times.month.to_numpy()
+    radiation = np.clip(900 * np.sin(np.pi * (hours - 6) / 12), 0, None) * rng.uniform(0.7, 1.0, HOURS)
+    return dict(
+        radiation=radiation, cloud_cover=rng.uniform(0, 0.4, HOURS),
+        ambient_temp=22 + 6 * np.sin(np.pi * (hours - 9) / 12), wind_speed=rng.uniform(0, 6, HOURS),
+        hours=hours, months=months
+    )
+
+
+def no_noise(loc=0.0, scale=1.0, size=None):
+    return np.zeros(size) if size is not None else 0.0
+
+
+def legacy_trajectory(boiler, size, solar, temp, weather):
+    trajectory = []
+    for h in range(HOURS):
+        if solar:
+            temp = boiler.compute_solar_heating(temp, weather["radiation"][h], weather["cloud_cover"][h],
+                                                weather["hours"][h], weather["months"][h], size)
+        temp = BoilerManager.compute_physical_cooling(temp, weather["ambient_temp"][h], size,
+                                                      weather["hours"][h], weather["wind_speed"][h])
+        trajectory.append(temp)
+    return trajectory
+
+
+def test_engine_matches_scalar_physics_without_noise():
+    boiler = BoilerManager(name="test", capacity_liters=100, has_solar=True, history_path=None)
+    configs = [(size, solar, temp) for size in BOILER_SIZES for solar in (True, False) for temp in (30.0, 55.0)]
+
+    for month in (1, 6):  # both seasonal caps
+        weather = synthetic_weather(month)
+        with mock.patch.object(np.random, "normal", no_noise):
+            expected = np.array([legacy_trajectory(boiler, *config, weather) for config in configs])
+
+        actual = ThermalEngine(noise=False).simulate(
+            start_temps=[c[2] for c in configs], volumes=[c[0] for c in configs], has_solar=[c[1] for c in configs],
+            apply_cooling=True, **weather
+        )
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+
+
+def test_boiler_thermal_engine_is_reproducible_with_a_seed():
+    weather = synthetic_weather()
+
+    def run(seed):
+        boiler = BoilerManager(name="test", capacity_liters=100, has_solar=True, history_path=None, seed=seed)
+        return boiler.thermal_engine.simulate(start_temps=40.0, volumes=100, has_solar=True, **weather)
+
+    np.testing.assert_array_equal(run(7), run(7))
+    assert not np.array_equal(run(7), run(8))